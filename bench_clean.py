@@ -0,0 +1,116 @@
+import argparse
+import json
+import os
+import re
+import time
+
+from process import TextCleaner, redundant_end, redundant_start
+from routing import CategoryRouter
+
+
+# Function reproducing the original five-pass regex cleaner, for comparison
+def legacy_clean_text(content, redundant_start, redundant_end):
+    """
+    Clean the text the way process.clean_text did before TextCleaner.
+
+    Args:
+        content (str): The raw content string.
+        redundant_start (str): The redundant starting pattern to remove.
+        redundant_end (str): The redundant ending pattern to remove.
+
+    Returns:
+        str: The cleaned content.
+    """
+    content = re.sub(re.escape(redundant_start), "", content, flags=re.IGNORECASE)
+    content = re.sub(f"{re.escape(redundant_end)}.*", "", content)
+    content = re.sub(r'\s+', ' ', content).strip()
+    content = re.sub(r'[^\w\s]', '', content)
+    return bytes(content, "utf-8").decode("unicode_escape")
+
+
+# Function to check the cleaner against the checked-in category files
+def check_outputs(data, cleaner):
+    """
+    Check that the cleaner reproduces every checked-in category file byte for byte.
+
+    Near-duplicate pages listed in aliases.json are left out, as process.py does.
+
+    Args:
+        data (dict): The raw scraped data from assignment_test.json.
+        cleaner (TextCleaner): The cleaner to check.
+
+    Returns:
+        bool: True if every category file is reproduced exactly.
+    """
+    aliases = {}
+    if os.path.exists("aliases.json"):
+        with open("aliases.json", "r", encoding="utf-8") as file:
+            aliases = json.load(file)
+
+    ok = True
+    router = CategoryRouter()
+    groups = router.split(data)
+    for name, hrefs in groups.items():
+        file_name = router.categories[name]["output"]
+        cleaned = {href: cleaner.clean(data[href]) for href in hrefs if href not in aliases}
+        with open(file_name, "r", encoding="utf-8") as file:
+            matches = json.dumps(cleaned, indent=4) == file.read()
+        ok = ok and matches
+        print(f"{file_name:>20}: {'identical' if matches else 'DIFFERENT'}")
+    return ok
+
+
+# Function to measure how many pages per second a clean function handles
+def pages_per_second(clean, pages, min_time=0.5):
+    """
+    Clean the pages repeatedly for at least `min_time` seconds.
+
+    Args:
+        clean (callable): Function taking the raw content and returning the cleaned text.
+        pages (list): The raw page texts.
+        min_time (float): Minimum number of seconds to measure for.
+
+    Returns:
+        float: The number of pages cleaned per second.
+    """
+    count = 0
+    start = time.perf_counter()
+    while True:
+        for page in pages:
+            clean(page)
+        count += len(pages)
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            return count / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the compiled cleaner against the original regex passes.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1000], help="synthetic page sizes in KB")
+    args = parser.parse_args()
+
+    with open("assignment_test.json", "r", encoding="utf-8") as file:
+        data = json.load(file)
+
+    cleaner = TextCleaner(redundant_start, redundant_end)
+    if not check_outputs(data, cleaner):
+        raise SystemExit("TextCleaner does not reproduce the category files")
+
+    def legacy(content):
+        return legacy_clean_text(content, redundant_start, redundant_end)
+
+    print(f"{'corpus':>12} {'legacy pages/s':>15} {'compiled pages/s':>17} {'speedup':>8}")
+    corpus = list(data.values())
+    old, new = pages_per_second(legacy, corpus), pages_per_second(cleaner.clean, corpus)
+    print(f"{'changi':>12} {old:>15.0f} {new:>17.0f} {new / old:>7.1f}x")
+
+    sample = "Terminal 3 opening hours, dining & shopping – café “Changi” fast check-in. "
+    for size in args.sizes:
+        body = sample * (size * 1024 // len(sample) + 1)
+        page = f"{redundant_start} {body} {redundant_end} Footer links © Changi Airport Group"
+        old, new = pages_per_second(legacy, [page]), pages_per_second(cleaner.clean, [page])
+        print(f"{str(size) + ' KB':>12} {old:>15.0f} {new:>17.0f} {new / old:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
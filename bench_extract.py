@@ -0,0 +1,55 @@
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from bs4 import BeautifulSoup
+
+from bench_scrape import make_page
+from extractors import BACKENDS
+from scrape import extract_text_from_html
+
+# The page assignment.html is a saved view-source of, and its entry in assignment_test.json
+GOLDEN_URL = "https://www.changiairport.com/in/en.html"
+
+
+# Function to recover the original page source from the saved view-source page
+def load_golden_page(file_path="assignment.html"):
+    """
+    Rebuild the HTML source of the page saved as a browser view-source page.
+
+    Args:
+        file_path (str): Path to the saved view-source HTML file.
+
+    Returns:
+        str: The original HTML source, one line per view-source row.
+    """
+    with open(file_path, "r", encoding="utf-8") as file:
+        soup = BeautifulSoup(file.read(), "html.parser")
+    return "\n".join(cell.get_text() for cell in soup.find_all("td", class_="line-content"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check and benchmark the HTML-to-text backends.")
+    parser.add_argument("--pages", type=int, default=400)
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    # Whether every backend reproduces assignment_test.json is checked by test_extractors.py
+    golden = load_golden_page()
+    pages = [golden.encode("utf-8")] + [make_page(i, paragraphs=400) for i in range(args.pages)]
+    print(f"{'backend':>10} {'processes':>10} {'pages/s':>9}")
+    for name in sorted(BACKENDS):
+        for processes in args.processes:
+            start = time.perf_counter()
+            if processes == 1:
+                for page in pages:
+                    extract_text_from_html(page, name)
+            else:
+                with ProcessPoolExecutor(max_workers=processes) as pool:
+                    list(pool.map(extract_text_from_html, pages, [name] * len(pages), chunksize=16))
+            elapsed = time.perf_counter() - start
+            print(f"{name:>10} {processes:>10} {len(pages) / elapsed:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from scrape import extract_hrefs, iter_hrefs
+
+
+# Function to write a synthetic seed page of roughly the requested size
+def make_seed_file(directory, size_mb):
+    """
+    Write a synthetic seed page made of repeated navigation blocks and content links.
+
+    Every block repeats the same navigation links, the way the Changi menu
+    repeats across assignment.html, and adds a few links of its own.
+
+    Args:
+        directory (str): Directory to write the file into.
+        size_mb (float): Approximate size of the file in megabytes.
+
+    Returns:
+        str: The path of the written file.
+    """
+    path = os.path.join(directory, f"seed_{size_mb}mb.html")
+    nav = "".join(
+        f'<li><a href="https://www.changiairport.com/in/en/{section}.html">{section}</a></li>'
+        for section in ("fly", "at-changi", "dine-and-shop", "experience", "happenings", "rewards", "help")
+    )
+    target = int(size_mb * 1024 * 1024)
+    written = 0
+    block = 0
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("<html><body>")
+        while written < target:
+            chunk = (
+                f"<nav><ul>{nav}</ul></nav><div class='card'><h2>Story {block}</h2>"
+                f"<p>Things to do on a trip, story number {block}.</p>"
+                f'<a href="/travel-the-world/story-{block}.html">Read more</a>'
+                f'<a href="#top">Back to top</a><script>track({block});</script></div>'
+            )
+            file.write(chunk)
+            written += len(chunk)
+            block += 1
+        file.write("</body></html>")
+    return path
+
+
+# Function to measure the time and peak Python memory of a call
+def measure(function):
+    """
+    Time a function, then run it again under tracemalloc for its peak memory.
+
+    The two runs are separate because tracing allocations slows the call down.
+
+    Args:
+        function (callable): The function to run without arguments.
+
+    Returns:
+        tuple: The result, the elapsed seconds and the peak traced memory in bytes.
+    """
+    start = time.perf_counter()
+    result = function()
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare soup-based and streaming href extraction.")
+    parser.add_argument("--sizes", type=float, nargs="+", default=[2, 8, 32], help="synthetic seed sizes in MB")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        files = ["assignment.html"] + [make_seed_file(directory, size) for size in args.sizes]
+        print(f"{'file':>20} {'MB':>6} {'path':>10} {'links':>7} {'seconds':>8} {'peak MB':>8}")
+        for path in files:
+            size = os.path.getsize(path) / (1024 * 1024)
+            soup_links, soup_time, soup_peak = measure(lambda: extract_hrefs(path))
+            stream_links, stream_time, stream_peak = measure(lambda: list(iter_hrefs(path)))
+            name = os.path.basename(path)
+            print(f"{name:>20} {size:>6.1f} {'soup':>10} {len(soup_links):>7} {soup_time:>8.2f} {soup_peak / 1e6:>8.1f}")
+            print(f"{name:>20} {size:>6.1f} {'streaming':>10} {len(stream_links):>7} {stream_time:>8.2f} {stream_peak / 1e6:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import argparse
+import contextlib
+import filecmp
+import io
+import json
+import os
+import random
+import shutil
+import tempfile
+
+from pipeline import EXECUTORS, run
+from process import redundant_end, redundant_start
+from routing import CategoryRouter
+
+
+# Function to write a synthetic corpus of page records shaped like the crawled site
+def make_corpus(file_path, pages, words_per_page=400, seed=0):
+    """
+    Write a JSONL corpus of synthetic page records.
+
+    Every page gets the site header and footer around a body of random words
+    from the real corpus, and a URL under one of the category prefixes, so the
+    pages are routed, cleaned and deduplicated like crawled ones.
+
+    Args:
+        file_path (str): Path of the JSONL file to write.
+        pages (int): Number of pages.
+        words_per_page (int): Number of body words per page.
+        seed (int): Seed of the random words.
+
+    Returns:
+        int: The size of the corpus in bytes.
+    """
+    with open("assignment_test.json", "r", encoding="utf-8") as file:
+        data = json.load(file)
+    vocabulary = sorted({word for text in data.values() for word in text.split()})
+    prefixes = [category["prefix"] for category in CategoryRouter().categories.values() if category["prefix"]]
+
+    generator = random.Random(seed)
+    with open(file_path, "w", encoding="utf-8") as file:
+        for index in range(pages):
+            url = f"{prefixes[index % len(prefixes)].rstrip('/')}/synthetic-{index}.html"
+            body = " ".join(generator.choices(vocabulary, k=words_per_page))
+            text = f"{redundant_start} {body} {redundant_end} Changi Airport Group footer links"
+            file.write(json.dumps({"url": url, "text": text}) + "\n")
+    return os.path.getsize(file_path)
+
+
+# Function to check that two runs wrote the same category files
+def same_outputs(first_dir, second_dir):
+    """
+    Compare the category files written to two directories.
+
+    Args:
+        first_dir (str): Output directory of the first run.
+        second_dir (str): Output directory of the second run.
+
+    Returns:
+        bool: True if every category file is byte-identical.
+    """
+    router = CategoryRouter()
+    return all(
+        filecmp.cmp(os.path.join(first_dir, category["output"]), os.path.join(second_dir, category["output"]),
+                    shallow=False)
+        for category in router.categories.values()
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the cleaning pipeline end to end on a synthetic corpus.")
+    parser.add_argument("--pages", type=int, default=10000)
+    parser.add_argument("--executors", nargs="+", choices=EXECUTORS, default=EXECUTORS)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument("--dedup", action="store_true", help="also remove near-duplicate pages (runs serially)")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp(prefix="bench_pipeline_")
+    try:
+        corpus = os.path.join(directory, "corpus.jsonl")
+        size = make_corpus(corpus, args.pages)
+        print(f"{args.pages} pages, {size / 1024 / 1024:.1f} MB, {os.cpu_count()} cores")
+        print(f"{'executor':>9} {'workers':>8} {'wall s':>8} {'pages/s':>9} {'output':>10}")
+
+        baseline_dir = None
+        for executor in args.executors:
+            for workers in ([1] if executor == "serial" else args.workers):
+                output_dir = os.path.join(directory, f"{executor}-{workers}")
+                os.mkdir(output_dir)
+                config = {
+                    "input": corpus,
+                    "output_dir": output_dir,
+                    "template": None,
+                    "manifest": None,
+                    "aliases": "aliases.json" if args.dedup else None,
+                    "executor": executor,
+                    "workers": workers,
+                    "chunk_size": args.chunk_size,
+                }
+                with contextlib.redirect_stdout(io.StringIO()):
+                    result = run(config)
+
+                if baseline_dir is None:
+                    baseline_dir, status = output_dir, "baseline"
+                else:
+                    status = "identical" if same_outputs(baseline_dir, output_dir) else "DIFFERENT"
+                print(
+                    f"{executor:>9} {workers:>8} {result['seconds']:>8.2f} "
+                    f"{args.pages / result['seconds']:>9.0f} {status:>10}"
+                )
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    main()
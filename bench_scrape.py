@@ -0,0 +1,194 @@
+import argparse
+import contextlib
+import hashlib
+import io
+import shutil
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import scrape
+from instrumentation import STAGES, StageProfiler, percentile
+from page_cache import PageCache
+from records import FAILED_TEXT
+
+
+# Function to build a synthetic HTML page similar in shape to a Changi page
+def make_page(index, paragraphs=40):
+    """
+    Build a synthetic HTML page with a script, a style block and body text.
+
+    Args:
+        index (int): The page number, used to make every page unique.
+        paragraphs (int): The number of paragraphs in the body.
+
+    Returns:
+        bytes: The encoded HTML page.
+    """
+    body = "".join(
+        f"<p>Page {index} paragraph {i} about flights, dining and shopping at the airport.</p>"
+        for i in range(paragraphs)
+    )
+    html = (
+        f"<html><head><title>Page {index}</title><style>p {{ color: red; }}</style></head>"
+        f"<body><nav><a href='/page-{index + 1}.html'>Next</a></nav>{body}"
+        f"<script>var page = {index};</script></body></html>"
+    )
+    return html.encode("utf-8")
+
+
+# Class serving synthetic pages with a fixed artificial latency
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    latency = 0.05
+    fail_every = 0
+    request_count = 0
+    count_lock = threading.Lock()
+
+    def do_GET(self):
+        with StandInHandler.count_lock:
+            StandInHandler.request_count += 1
+            count = StandInHandler.request_count
+
+        time.sleep(self.latency)
+        if self.fail_every and count % self.fail_every == 0:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        digits = "".join(ch for ch in self.path if ch.isdigit())
+        content = make_page(int(digits or 0))
+        etag = f'"{hashlib.md5(content).hexdigest()}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# Function to start the stand-in HTTP server in a background thread
+@contextlib.contextmanager
+def stand_in_server(latency=0.05, fail_every=0):
+    """
+    Run a local HTTP server that stands in for the Changi site.
+
+    Args:
+        latency (float): Seconds every request waits before it is answered.
+        fail_every (int): Answer every Nth request with a 503, or 0 to never fail.
+
+    Yields:
+        str: The base URL of the running server.
+    """
+    StandInHandler.latency = latency
+    StandInHandler.fail_every = fail_every
+    StandInHandler.request_count = 0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StandInHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_port}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+# Function to run one crawl and measure throughput and completion latency
+def run_crawl(hrefs, **options):
+    """
+    Crawl the given URLs and time when each page finishes.
+
+    Args:
+        hrefs (list): The URLs to crawl.
+        **options: Keyword arguments passed to `scrape.extract_text_for_hrefs`.
+
+    Returns:
+        dict: Wall time, pages per second and completion latency percentiles.
+    """
+    finished = []
+    extract = scrape.extract_text_from_html
+
+    def timed_extract(html_content, backend=None):
+        text = extract(html_content, backend)
+        finished.append(time.perf_counter() - start)
+        return text
+
+    scrape.extract_text_from_html = timed_extract
+    try:
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = scrape.extract_text_for_hrefs(hrefs, **options)
+        wall = time.perf_counter() - start
+    finally:
+        scrape.extract_text_from_html = extract
+
+    failed = sum(1 for text in results.values() if text == FAILED_TEXT)
+    return {
+        "wall": wall,
+        "pages_per_sec": len(hrefs) / wall,
+        "p50": percentile(finished, 0.50) if finished else 0.0,
+        "p95": percentile(finished, 0.95) if finished else 0.0,
+        "p99": percentile(finished, 0.99) if finished else 0.0,
+        "failed": failed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the sequential and concurrent crawl paths offline.")
+    parser.add_argument("--pages", type=int, default=130)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--per-host", type=int, default=8)
+    parser.add_argument("--fail-every", type=int, default=0)
+    parser.add_argument("--cache", action="store_true", help="also compare a cold and a warm run through the page cache")
+    parser.add_argument("--report", help="also run an instrumented crawl and save its per-stage report to this path")
+    parser.add_argument("--profile-stage", choices=STAGES, help="export cProfile statistics for this stage of the instrumented crawl")
+    args = parser.parse_args()
+
+    with stand_in_server(args.latency, args.fail_every) as base_url:
+        hrefs = [f"{base_url}/page-{i}.html" for i in range(args.pages)]
+        print(f"{'workers':>8} {'wall s':>8} {'pages/s':>9} {'p50 s':>7} {'p95 s':>7} {'p99 s':>7} {'failed':>7}")
+        for workers in args.workers:
+            stats = run_crawl(hrefs, workers=workers, per_host=args.per_host, backoff=0.05)
+            print(
+                f"{workers:>8} {stats['wall']:>8.2f} {stats['pages_per_sec']:>9.1f} {stats['p50']:>7.2f} "
+                f"{stats['p95']:>7.2f} {stats['p99']:>7.2f} {stats['failed']:>7}"
+            )
+
+        if args.cache:
+            workers = max(args.workers)
+            cache_dir = tempfile.mkdtemp(prefix="page_cache_")
+            try:
+                for run in ("cold", "warm"):
+                    cache = PageCache(cache_dir)
+                    stats = run_crawl(hrefs, workers=workers, per_host=args.per_host, backoff=0.05, cache=cache)
+                    cache.save()
+                    print(f"{run} cache run with {workers} workers: {stats['wall']:.2f} s")
+                    print(f"  {cache.report()}")
+            finally:
+                shutil.rmtree(cache_dir)
+
+        if args.report:
+            workers = max(args.workers)
+            profiler = StageProfiler(args.profile_stage)
+            stats = run_crawl(hrefs, workers=workers, per_host=args.per_host, backoff=0.05, profiler=profiler)
+            profiler.save(args.report)
+            print(f"instrumented run with {workers} workers: {stats['wall']:.2f} s")
+            print(profiler.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+import json
+import os
+import sys
+from collections import Counter
+from itertools import islice
+
+# Default location of the learned template and detection settings
+DEFAULT_TEMPLATE_PATH = "template.json"
+DEFAULT_MIN_SUPPORT = 0.5
+DEFAULT_SHINGLE_SIZE = 8
+DEFAULT_MIN_RUN = 20
+DEFAULT_MAX_PREFIX_TOKENS = 5000
+DEFAULT_SAMPLE_SIZE = 2000
+DEFAULT_SHINGLE_SAMPLE_SIZE = 200
+
+
+# Function to find the longest token prefix shared by enough pages
+def common_prefix(token_lists, min_count, max_tokens=DEFAULT_MAX_PREFIX_TOKENS):
+    """
+    Find the longest token prefix that at least `min_count` pages start with.
+
+    The prefix is grown one position at a time: the pages still on the prefix
+    vote for their next token, the most common token is appended and the
+    pages with another token drop out. It stops as soon as fewer than
+    `min_count` pages agree, so only the shared header is ever read and
+    memory stays proportional to the number of pages.
+
+    Args:
+        token_lists (list): The tokens of every page.
+        min_count (int): Minimum number of pages that must share the prefix.
+        max_tokens (int): Maximum prefix length considered, in tokens.
+
+    Returns:
+        list: The tokens of the shared prefix, empty if there is none.
+    """
+    prefix = []
+    remaining = token_lists
+    for position in range(max_tokens):
+        votes = Counter(tokens[position] for tokens in remaining if len(tokens) > position)
+        if not votes:
+            break
+        # Ties go to the token seen first, as pages are counted in order
+        token, count = votes.most_common(1)[0]
+        if count < min_count:
+            break
+        prefix.append(token)
+        remaining = [tokens for tokens in remaining if len(tokens) > position and tokens[position] == token]
+    return prefix
+
+
+# Function to find the token run where the shared footer begins
+def footer_marker(token_lists, prefix, min_count, shingle_size=DEFAULT_SHINGLE_SIZE, min_run=DEFAULT_MIN_RUN,
+                  sample_size=DEFAULT_SHINGLE_SAMPLE_SIZE):
+    """
+    Find the shingle that opens the shared footer of the pages.
+
+    The part of every page after the prefix is cut into overlapping shingles
+    of `shingle_size` tokens, and the number of pages containing each shingle
+    is counted over an evenly spaced sample of `sample_size` pages, with
+    `min_count` scaled to the sample. Shingles shared by enough of the corpus
+    are shared by enough of the sample, and the counter no longer grows with
+    the number of pages. In each page, the first run of at least `min_run`
+    consecutive shared shingles after the prefix is taken as the start of its
+    footer, and the opening shingle most pages agree on becomes the marker.
+
+    Args:
+        token_lists (list): The tokens of every page.
+        prefix (list): The shared prefix tokens, skipped when looking for the footer.
+        min_count (int): Minimum number of pages a shingle and the marker must appear in.
+        shingle_size (int): Number of tokens per shingle.
+        min_run (int): Minimum number of consecutive shared shingles in a footer.
+        sample_size (int): Maximum number of pages whose shingles are counted.
+
+    Returns:
+        list: The tokens of the footer marker, empty if there is none.
+    """
+    def tail_start(tokens):
+        return len(prefix) if tokens[:len(prefix)] == prefix else 0
+
+    step = max(1, -(-len(token_lists) // sample_size))
+    sample = token_lists[::step]
+    sample_min_count = max(2, min_count * len(sample) // max(1, len(token_lists)))
+
+    document_frequency = Counter()
+    for tokens in sample:
+        document_frequency.update({
+            hash(tuple(tokens[i:i + shingle_size])) for i in range(tail_start(tokens), len(tokens) - shingle_size + 1)
+        })
+
+    votes = Counter()
+    for tokens in token_lists:
+        run = 0
+        for i in range(tail_start(tokens), len(tokens) - shingle_size + 1):
+            if document_frequency[hash(tuple(tokens[i:i + shingle_size]))] < sample_min_count:
+                run = 0
+                continue
+            run += 1
+            if run == min_run:
+                first = i - min_run + 1
+                votes[tuple(tokens[first:first + shingle_size])] += 1
+                break
+
+    if not votes:
+        return []
+    marker, count = votes.most_common(1)[0]
+    return list(marker) if count >= min_count else []
+
+
+# Function to learn the shared header and footer of a crawled corpus
+def learn_template(texts, min_support=DEFAULT_MIN_SUPPORT, shingle_size=DEFAULT_SHINGLE_SIZE, min_run=DEFAULT_MIN_RUN):
+    """
+    Detect the boilerplate header and footer shared across the pages.
+
+    Args:
+        texts (iterable): The extracted text of every page.
+        min_support (float): Fraction of pages that must share a header or footer.
+        shingle_size (int): Number of tokens per shingle when looking for the footer.
+        min_run (int): Minimum number of consecutive shared shingles in a footer.
+
+    Returns:
+        dict: The template, with the `start` text to remove and the `end` marker
+            to cut at (empty strings when not found), plus the number of pages
+            it was learned from.
+    """
+    # Share one string object per distinct token, since pages repeat the same words
+    token_lists = [list(map(sys.intern, text.split())) for text in texts]
+    min_count = max(2, int(min_support * len(token_lists)))
+
+    prefix = common_prefix(token_lists, min_count)
+    marker = footer_marker(token_lists, prefix, min_count, shingle_size, min_run)
+    return {"start": " ".join(prefix), "end": " ".join(marker), "pages": len(token_lists)}
+
+
+# Function to measure how many pages a template still applies to
+def template_support(template, texts):
+    """
+    Compute the fraction of pages that start with the template header and contain its footer.
+
+    Args:
+        template (dict): The template with `start` and `end` texts.
+        texts (list): The extracted text of every page.
+
+    Returns:
+        float: The fraction of matching pages, 0 for an empty corpus.
+    """
+    if not texts:
+        return 0.0
+    start = template["start"].lower()
+    matching = sum(1 for text in texts if text.lower().startswith(start) and template["end"] in text)
+    return matching / len(texts)
+
+
+# Function to read the cached template without validating it
+def read_template(path=DEFAULT_TEMPLATE_PATH):
+    """
+    Read the template cached by `load_template`.
+
+    Args:
+        path (str): Path of the cached template JSON file.
+
+    Returns:
+        dict: The cached template, or None if there is none yet.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+# Function to reuse the cached template, relearning it when the site has changed
+def load_template(texts, path=DEFAULT_TEMPLATE_PATH, min_support=DEFAULT_MIN_SUPPORT, sample_size=DEFAULT_SAMPLE_SIZE):
+    """
+    Load the cached template, or learn and cache a new one.
+
+    The cached template is reused as long as at least `min_support` of the
+    pages still match it, so a change to the site menu triggers relearning.
+    Only the first `sample_size` pages are read, since boilerplate shared by
+    the corpus is shared by a sample of it as well.
+
+    Args:
+        texts (iterable): The extracted text of every page.
+        path (str): Path of the cached template JSON file.
+        min_support (float): Fraction of pages the template must match.
+        sample_size (int): Maximum number of pages to read.
+
+    Returns:
+        dict: The template, see `learn_template`.
+    """
+    texts = list(islice(texts, sample_size))
+    template = read_template(path)
+    if template is not None and template["start"] and template["end"]:
+        if template_support(template, texts) >= min_support:
+            return template
+
+    template = learn_template(texts, min_support)
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(template, file, indent=4)
+    return template
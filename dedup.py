@@ -0,0 +1,174 @@
+import zlib
+
+# Default MinHash / LSH settings: 64 signature slots in 16 bands of 4 rows
+DEFAULT_THRESHOLD = 0.8
+DEFAULT_NUM_PERM = 64
+DEFAULT_BANDS = 16
+DEFAULT_SHINGLE_SIZE = 5
+
+# Constants of the 64-bit multiplicative hash that spreads shingle hashes over the bins
+HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+HASH_MASK = (1 << 64) - 1
+
+
+# Function to cut a text into hashed word shingles
+def shingle_hashes(text, size=DEFAULT_SHINGLE_SIZE):
+    """
+    Return the set of hashed `size`-word shingles of a text.
+
+    Texts shorter than one shingle are hashed as a single shingle.
+
+    Args:
+        text (str): The page text.
+        size (int): Number of words per shingle.
+
+    Returns:
+        set: The 32-bit CRC of every shingle.
+    """
+    words = text.split()
+    if len(words) <= size:
+        return {zlib.crc32(" ".join(words).encode("utf-8"))}
+    return {zlib.crc32(" ".join(words[i:i + size]).encode("utf-8")) for i in range(len(words) - size + 1)}
+
+
+# Class clustering near-duplicate pages with MinHash and locality-sensitive hashing
+class NearDuplicateIndex:
+    """
+    Index of MinHash signatures that clusters near-duplicate pages.
+
+    Signatures use one-permutation hashing: every shingle is hashed once and
+    the hash picks the signature slot it competes for, so computing a
+    signature is linear in the number of shingles rather than in shingles
+    times hash functions. Empty slots of short texts borrow the next filled
+    slot's value (rotation densification).
+
+    Every page added is compared only with the canonical pages that share at
+    least one LSH band with it, so lookups stay sub-linear in the number of
+    pages. A page whose estimated Jaccard similarity to one of those is at
+    least `threshold` becomes an alias of it; otherwise it becomes the
+    canonical page of a new cluster.
+
+    Args:
+        threshold (float): Minimum estimated Jaccard similarity of near-duplicates.
+        num_perm (int): Number of slots in a signature.
+        bands (int): Number of LSH bands; `num_perm` must be divisible by it.
+        shingle_size (int): Number of words per shingle.
+        seed (int): Seed of the shingle hash, fixed so signatures are reproducible.
+    """
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD, num_perm=DEFAULT_NUM_PERM, bands=DEFAULT_BANDS,
+                 shingle_size=DEFAULT_SHINGLE_SIZE, seed=1):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+        self.seed = seed
+        self.num_perm = num_perm
+        self.threshold = threshold
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.buckets = [{} for _ in range(bands)]
+        self.signatures = {}
+        self.aliases = {}
+
+    def settings(self):
+        """
+        Return the settings a signature depends on, to tell whether stored signatures can be reused.
+
+        Returns:
+            dict: The number of slots, shingle size and seed.
+        """
+        return {"num_perm": self.num_perm, "shingle_size": self.shingle_size, "seed": self.seed}
+
+    def signature(self, text):
+        """
+        Compute the MinHash signature of a text.
+
+        Args:
+            text (str): The page text.
+
+        Returns:
+            tuple: The minimum shingle hash falling into every slot.
+        """
+        slots = [None] * self.num_perm
+        for shingle in shingle_hashes(text, self.shingle_size):
+            value = ((shingle + self.seed) * HASH_MULTIPLIER) & HASH_MASK
+            slot, value = value % self.num_perm, value // self.num_perm
+            if slots[slot] is None or value < slots[slot]:
+                slots[slot] = value
+
+        # Fill empty slots from the next filled slot, offset by the distance to it
+        for index in range(self.num_perm):
+            if slots[index] is None:
+                distance = 1
+                while slots[(index + distance) % self.num_perm] is None:
+                    distance += 1
+                slots[index] = slots[(index + distance) % self.num_perm] + distance * (HASH_MASK // self.num_perm)
+        return tuple(slots)
+
+    def _band_keys(self, signature):
+        return [signature[i * self.rows:(i + 1) * self.rows] for i in range(len(self.buckets))]
+
+    def _similarity(self, first, second):
+        return sum(1 for x, y in zip(first, second) if x == y) / len(first)
+
+    def find(self, signature):
+        """
+        Find the canonical page most similar to a signature.
+
+        Args:
+            signature (tuple): A signature from `signature`.
+
+        Returns:
+            str: The URL of the canonical page, or None if no page is similar enough.
+        """
+        best_url, best_similarity = None, self.threshold
+        seen = set()
+        for bucket, key in zip(self.buckets, self._band_keys(signature)):
+            for url in bucket.get(key, ()):
+                if url in seen:
+                    continue
+                seen.add(url)
+                similarity = self._similarity(signature, self.signatures[url])
+                if similarity >= best_similarity:
+                    best_url, best_similarity = url, similarity
+        return best_url
+
+    def add(self, url, text, signature=None):
+        """
+        Add a page to the index.
+
+        Args:
+            url (str): The page URL.
+            text (str): The page text, only read if `signature` is not given.
+            signature (tuple, optional): The page's signature, e.g. stored by an earlier run.
+
+        Returns:
+            str: The URL of the page's canonical copy, which is `url` itself for a new cluster.
+        """
+        if url in self.aliases:
+            return self.aliases[url]
+        if url in self.signatures:
+            return url
+
+        if signature is None:
+            signature = self.signature(text)
+        canonical = self.find(signature)
+        if canonical is not None:
+            self.aliases[url] = canonical
+            return canonical
+
+        self.signatures[url] = signature
+        for bucket, key in zip(self.buckets, self._band_keys(signature)):
+            bucket.setdefault(key, []).append(url)
+        return url
+
+    def clusters(self):
+        """
+        Group the aliases by their canonical page.
+
+        Returns:
+            dict: Canonical URL to the list of its aliases, for clusters with at least one alias.
+        """
+        clusters = {}
+        for alias, canonical in self.aliases.items():
+            clusters.setdefault(canonical, []).append(alias)
+        return clusters
@@ -0,0 +1,116 @@
+from bs4 import BeautifulSoup
+from bs4.dammit import UnicodeDammit
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+# Elements whose text is never part of the visible page text
+SKIPPED_TAGS = ("script", "style", "template")
+
+# Backend used when none is requested. The faster lxml and selectolax backends
+# are opt-in, since only bs4 produced the text in assignment_test.json
+DEFAULT_BACKEND = "bs4"
+
+# Registry of available backends, keyed by name
+BACKENDS = {}
+
+
+# Function to register an HTML-to-text backend under a name
+def register_backend(name):
+    """
+    Register a function turning HTML into the raw visible text of its body.
+
+    A backend receives the HTML as a string and returns the stripped text
+    nodes of the body joined with single spaces, without scripts and styles.
+
+    Args:
+        name (str): The name used to select the backend.
+
+    Returns:
+        callable: A decorator registering the function.
+    """
+    def decorator(function):
+        BACKENDS[name] = function
+        return function
+    return decorator
+
+
+# Function to decode raw HTML bytes the same way for every backend
+def decode_html(html_content):
+    """
+    Decode HTML bytes using the declared or detected character set.
+
+    Args:
+        html_content (bytes or str): The raw HTML content.
+
+    Returns:
+        str: The decoded HTML.
+    """
+    if isinstance(html_content, str):
+        return html_content
+    return UnicodeDammit(html_content, is_html=True).unicode_markup
+
+
+# Backend using BeautifulSoup with the built-in html.parser, always available
+@register_backend("bs4")
+def bs4_text(html_content):
+    soup = BeautifulSoup(html_content, "html.parser")
+
+    # Remove script and style elements
+    for element in soup(["script", "style"]):
+        element.decompose()
+
+    return soup.body.get_text(separator=" ", strip=True)
+
+
+# Backend using lxml, registered when lxml is installed
+if lxml is not None:
+    @register_backend("lxml")
+    def lxml_text(html_content):
+        body = lxml.html.document_fromstring(html_content).body
+
+        # Empty skipped elements but keep their tail text, which belongs to the parent
+        for element in list(body.iter(*SKIPPED_TAGS)):
+            tail = element.tail
+            element.clear()
+            element.tail = tail
+
+        strings = (string.strip() for string in body.itertext())
+        return " ".join(string for string in strings if string)
+
+
+# Backend using selectolax's lexbor parser, registered when selectolax is installed
+if LexborHTMLParser is not None:
+    @register_backend("selectolax")
+    def selectolax_text(html_content):
+        tree = LexborHTMLParser(html_content)
+        tree.strip_tags(list(SKIPPED_TAGS))
+        return tree.body.text(separator=" ", strip=True)
+
+
+# Function to look up a backend by name
+def get_backend(name=None):
+    """
+    Return the backend with the given name, or the default one.
+
+    Args:
+        name (str, optional): "bs4", "lxml" or "selectolax". Defaults to `DEFAULT_BACKEND`.
+
+    Returns:
+        callable: The backend function.
+
+    Raises:
+        ValueError: If the backend is unknown or its parser is not installed.
+    """
+    if name is None:
+        name = DEFAULT_BACKEND
+    if name not in BACKENDS:
+        raise ValueError(f"HTML backend {name!r} is not available, choose from {sorted(BACKENDS)}")
+    return BACKENDS[name]
@@ -0,0 +1,229 @@
+import cProfile
+import json
+import math
+import sys
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+try:
+    import resource
+except ImportError:  # resource is Unix only
+    resource = None
+
+# Stages of the pipeline that are timed; "fingerprint" is the near-duplicate check during a crawl
+STAGES = ["fetch", "extract", "fingerprint", "clean", "save"]
+
+# Default number of slowest page stages listed in the run report
+DEFAULT_SLOWEST = 10
+
+
+# Function to return a percentile from a list of numbers
+def percentile(values, fraction):
+    """
+    Return the nearest-rank percentile of a list of numbers.
+
+    Args:
+        values (list): The measured values.
+        fraction (float): The percentile as a fraction between 0 and 1.
+
+    Returns:
+        float: The value at that percentile.
+    """
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+
+# Function to read the peak resident set size of the process
+def peak_rss_kb():
+    """
+    Return the peak resident set size of the current process so far.
+
+    Returns:
+        int: The peak RSS in KB, or 0 where the `resource` module is not available.
+    """
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux reports KB
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+# Class recording how long every pipeline stage takes for every page
+class StageProfiler:
+    """
+    Opt-in instrumentation of the scrape and process pipeline.
+
+    Every timed call records its stage, URL, duration, the number of bytes
+    it handled and the peak RSS of the process when it finished. Stages that
+    raise the peak RSS are charged with the growth, so the report shows which
+    stage drives memory use. Spans may be recorded from several threads.
+
+    With `profile_stage`, calls of that stage also run under cProfile. Only
+    one call is profiled at a time, so with several fetch threads the profile
+    covers a sample of the calls; work sent to a process pool is not profiled.
+
+    Args:
+        profile_stage (str, optional): The stage to run under cProfile, one of `STAGES`.
+    """
+
+    def __init__(self, profile_stage=None):
+        self.profile_stage = profile_stage
+        self.profile = cProfile.Profile() if profile_stage else None
+        self.profile_lock = threading.Lock()
+        self.lock = threading.Lock()
+        self.spans = []
+        self.started = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name, url=None):
+        """
+        Time one call of a stage.
+
+        The caller may set the `bytes` key of the yielded span.
+
+        Args:
+            name (str): The stage name.
+            url (str, optional): The page the call handles.
+
+        Yields:
+            dict: The span being recorded.
+        """
+        span = {"stage": name, "url": url, "bytes": 0}
+        profiling = name == self.profile_stage and self.profile_lock.acquire(blocking=False)
+        rss_before = peak_rss_kb()
+        start = time.perf_counter()
+        if profiling:
+            self.profile.enable()
+        try:
+            yield span
+        finally:
+            if profiling:
+                self.profile.disable()
+                self.profile_lock.release()
+            span["seconds"] = time.perf_counter() - start
+            span["peak_rss_kb"] = peak_rss_kb()
+            span["rss_growth_kb"] = span["peak_rss_kb"] - rss_before
+            with self.lock:
+                self.spans.append(span)
+
+    def record(self, name, url, seconds, size=0):
+        """
+        Record a call timed elsewhere, e.g. in a worker process.
+
+        The memory of the worker is not known, so the span carries the peak RSS
+        of this process and no growth.
+
+        Args:
+            name (str): The stage name.
+            url (str): The page the call handled.
+            seconds (float): The duration of the call.
+            size (int): The number of bytes it handled.
+        """
+        span = {"stage": name, "url": url, "bytes": size, "seconds": seconds, "peak_rss_kb": peak_rss_kb(),
+                "rss_growth_kb": 0}
+        with self.lock:
+            self.spans.append(span)
+
+    def report(self, slowest=DEFAULT_SLOWEST):
+        """
+        Summarize the recorded spans.
+
+        Args:
+            slowest (int): Number of slowest page stages to list.
+
+        Returns:
+            dict: The run report, with per-stage `count`, `total_seconds`,
+                `p50`, `p95`, `p99`, `max`, `bytes`, `peak_rss_kb` and
+                `rss_growth_kb` under `stages`, the slowest spans under
+                `slowest` and the seconds and bytes of every stage of every
+                page under `pages`.
+        """
+        with self.lock:
+            spans = list(self.spans)
+
+        stages = {}
+        for name in STAGES + sorted({span["stage"] for span in spans} - set(STAGES)):
+            stage_spans = [span for span in spans if span["stage"] == name]
+            if not stage_spans:
+                continue
+            seconds = [span["seconds"] for span in stage_spans]
+            stages[name] = {
+                "count": len(stage_spans),
+                "total_seconds": sum(seconds),
+                "p50": percentile(seconds, 0.50),
+                "p95": percentile(seconds, 0.95),
+                "p99": percentile(seconds, 0.99),
+                "max": max(seconds),
+                "bytes": sum(span["bytes"] for span in stage_spans),
+                "peak_rss_kb": max(span["peak_rss_kb"] for span in stage_spans),
+                "rss_growth_kb": sum(span["rss_growth_kb"] for span in stage_spans),
+            }
+
+        pages = {}
+        for span in spans:
+            if span["url"] is not None:
+                pages.setdefault(span["url"], {})[span["stage"]] = {"seconds": span["seconds"], "bytes": span["bytes"]}
+
+        ordered = sorted(spans, key=lambda span: span["seconds"], reverse=True)[:slowest]
+        return {
+            "elapsed_seconds": time.perf_counter() - self.started,
+            "peak_rss_kb": peak_rss_kb(),
+            "stages": stages,
+            "slowest": [
+                {"stage": span["stage"], "url": span["url"], "seconds": span["seconds"], "bytes": span["bytes"]}
+                for span in ordered
+            ],
+            "pages": pages,
+        }
+
+    def save(self, report_path, profile_path=None, slowest=DEFAULT_SLOWEST):
+        """
+        Save the run report as JSON, and the cProfile statistics if a stage was profiled.
+
+        The statistics can be read with `python -m pstats <profile_path>`.
+
+        Args:
+            report_path (str): Path of the JSON report.
+            profile_path (str, optional): Path of the cProfile output, defaults to
+                `<report_path>.<stage>.prof`.
+            slowest (int): Number of slowest page stages to list.
+        """
+        with open(report_path, "w", encoding="utf-8") as file:
+            json.dump(self.report(slowest), file, indent=4)
+        if self.profile is not None:
+            self.profile.dump_stats(profile_path or f"{report_path}.{self.profile_stage}.prof")
+
+    def summary(self):
+        """
+        Return a one-line summary per stage for the console.
+
+        Returns:
+            str: The count, total and p50/p95/p99 latency of every stage.
+        """
+        lines = []
+        for name, stats in self.report(slowest=0)["stages"].items():
+            lines.append(
+                f"{name:>8}: {stats['count']} calls, {stats['total_seconds']:.2f}s total, "
+                f"p50 {stats['p50'] * 1000:.1f}ms, p95 {stats['p95'] * 1000:.1f}ms, p99 {stats['p99'] * 1000:.1f}ms"
+            )
+        return "\n".join(lines)
+
+
+# Function to time a stage with an optional profiler
+def timed(profiler, name, url=None):
+    """
+    Time one call of a stage if instrumentation is enabled.
+
+    Args:
+        profiler (StageProfiler, optional): The profiler, or None to record nothing.
+        name (str): The stage name.
+        url (str, optional): The page the call handles.
+
+    Returns:
+        context manager: Yields the span dict, whose `bytes` key the caller may set.
+    """
+    if profiler is None:
+        return nullcontext({})
+    return profiler.stage(name, url)
@@ -0,0 +1,58 @@
+import hashlib
+import json
+import os
+
+# Default location of the processing manifest
+DEFAULT_MANIFEST_PATH = "manifest.json"
+
+
+# Function to hash the cleaning configuration
+def config_hash(redundant_start, redundant_end):
+    """
+    Compute a hash of the cleaning configuration.
+
+    Args:
+        redundant_start (str): The redundant starting pattern.
+        redundant_end (str): The redundant ending pattern.
+
+    Returns:
+        str: The hex SHA-256 digest of both patterns.
+    """
+    return hashlib.sha256(json.dumps([redundant_start, redundant_end]).encode("utf-8")).hexdigest()
+
+
+# Function to load the manifest of the previous run
+def load_manifest(path=DEFAULT_MANIFEST_PATH):
+    """
+    Load the manifest written by the previous processing run.
+
+    The manifest records the cleaning configuration hash and, for every page
+    in input order, the hash of its raw text and the category it was saved in.
+    With near-duplicate removal, every page also records its MinHash signature
+    and its canonical page (`alias_of`), and the manifest records the
+    signature settings under `dedup`.
+
+    Args:
+        path (str): Path of the manifest JSON file.
+
+    Returns:
+        dict: The manifest, with `config` and `pages` keys. Empty if there is no manifest yet.
+    """
+    if not os.path.exists(path):
+        return {"config": None, "pages": {}}
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+# Function to save the manifest of the current run
+def save_manifest(manifest, path=DEFAULT_MANIFEST_PATH):
+    """
+    Save the manifest of the current processing run.
+
+    Args:
+        manifest (dict): The manifest, with `config` and `pages` keys.
+        path (str): Path of the manifest JSON file.
+    """
+    # json.dumps encodes in C, unlike json.dump which streams through the pure-Python encoder
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(json.dumps(manifest))
@@ -0,0 +1,227 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from extractors import DEFAULT_BACKEND
+
+# Default location and size limit of the on-disk page cache
+DEFAULT_CACHE_DIR = ".page_cache"
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+# Function to hash a response body
+def hash_body(content):
+    """
+    Compute a stable hash of a response body.
+
+    Args:
+        content (bytes): The raw response body.
+
+    Returns:
+        str: The hex SHA-256 digest of the body.
+    """
+    return hashlib.sha256(content).hexdigest()
+
+
+# Class storing validators and extracted text of fetched pages on disk
+class PageCache:
+    """
+    On-disk response cache keyed by URL.
+
+    For every page the cache keeps the ETag and Last-Modified headers, the hash
+    and size of the body and the text extracted from it. The next crawl sends
+    the validators as a conditional GET and reuses the cached text when the
+    server answers 304 Not Modified. The text is only reused for the HTML
+    backend that extracted it; entries of another backend, or stored before
+    the backend was recorded, count as misses. Entries are evicted least recently used
+    first once the stored text exceeds `max_bytes`.
+
+    Args:
+        directory (str): Directory holding the index and the cached texts.
+        max_bytes (int): Maximum total size of the cached texts in bytes.
+    """
+
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(directory, "index.json")
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+        self.stats = {
+            "requests": 0,
+            "hits": 0,
+            "not_modified": 0,
+            "unchanged": 0,
+            "misses": 0,
+            "evictions": 0,
+            "bytes_downloaded": 0,
+            "bytes_saved": 0,
+        }
+
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as file:
+                for entry in json.load(file):
+                    self.entries[entry["url"]] = entry
+                    self.total_bytes += entry["text_size"]
+
+    def _text_path(self, url):
+        name = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{name}.txt")
+
+    def _read_text(self, url):
+        try:
+            with open(self._text_path(url), "r", encoding="utf-8") as file:
+                return file.read()
+        except OSError:
+            return None
+
+    def _remove(self, url):
+        entry = self.entries.pop(url)
+        self.total_bytes -= entry["text_size"]
+        try:
+            os.remove(self._text_path(url))
+        except OSError:
+            pass
+
+    def _lookup(self, url, backend):
+        entry = self.entries.get(url)
+        if entry is None or entry.get("backend") != backend:
+            return None
+        return entry
+
+    def conditional_headers(self, url, backend=DEFAULT_BACKEND):
+        """
+        Build the conditional request headers for a URL.
+
+        Args:
+            url (str): The URL about to be fetched.
+            backend (str): The HTML backend the text will be extracted with.
+
+        Returns:
+            dict: If-None-Match / If-Modified-Since headers, empty for unknown URLs
+                and for entries of another backend.
+        """
+        with self.lock:
+            self.stats["requests"] += 1
+            entry = self._lookup(url, backend)
+            if entry is None:
+                self.stats["misses"] += 1
+                return {}
+            self.stats["hits"] += 1
+
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def not_modified(self, url, backend=DEFAULT_BACKEND):
+        """
+        Return the cached text for a URL the server answered with 304.
+
+        Args:
+            url (str): The revalidated URL.
+            backend (str): The HTML backend the text must have been extracted with.
+
+        Returns:
+            str: The cached extracted text, or None if it is no longer on disk or
+                was extracted with another backend.
+        """
+        text = self._read_text(url)
+        with self.lock:
+            entry = self._lookup(url, backend)
+            if entry is None or text is None:
+                return None
+            self.entries.move_to_end(url)
+            self.stats["not_modified"] += 1
+            self.stats["bytes_saved"] += entry["body_size"]
+        return text
+
+    def unchanged(self, url, content, backend=DEFAULT_BACKEND):
+        """
+        Return the cached text if a freshly downloaded body has not changed.
+
+        Args:
+            url (str): The fetched URL.
+            content (bytes): The downloaded response body.
+            backend (str): The HTML backend the text must have been extracted with.
+
+        Returns:
+            str: The cached extracted text, or None if the body is new or different
+                or the text was extracted with another backend.
+        """
+        with self.lock:
+            self.stats["bytes_downloaded"] += len(content)
+            entry = self._lookup(url, backend)
+            if entry is None or entry["body_hash"] != hash_body(content):
+                return None
+
+        text = self._read_text(url)
+        if text is not None:
+            with self.lock:
+                if url in self.entries:
+                    self.entries.move_to_end(url)
+                self.stats["unchanged"] += 1
+        return text
+
+    def store(self, url, response, text, backend=DEFAULT_BACKEND):
+        """
+        Store the validators and extracted text of a fetched page.
+
+        Args:
+            url (str): The fetched URL.
+            response (requests.Response): The 200 response for the URL.
+            text (str): The text extracted from the response body.
+            backend (str): The HTML backend the text was extracted with.
+        """
+        encoded = text.encode("utf-8")
+        with open(self._text_path(url), "wb") as file:
+            file.write(encoded)
+
+        entry = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "body_hash": hash_body(response.content),
+            "body_size": len(response.content),
+            "text_size": len(encoded),
+            "backend": backend,
+        }
+        with self.lock:
+            if url in self.entries:
+                self.total_bytes -= self.entries.pop(url)["text_size"]
+            self.entries[url] = entry
+            self.total_bytes += entry["text_size"]
+
+            while self.total_bytes > self.max_bytes and len(self.entries) > 1:
+                oldest = next(iter(self.entries))
+                self._remove(oldest)
+                self.stats["evictions"] += 1
+
+    def save(self):
+        """
+        Write the cache index to disk.
+        """
+        with self.lock:
+            entries = list(self.entries.values())
+        with open(self.index_path, "w", encoding="utf-8") as file:
+            json.dump(entries, file, indent=4)
+
+    def report(self):
+        """
+        Format the cache statistics of the current run.
+
+        Returns:
+            str: A one-line summary of hits, 304s, evictions and bytes saved.
+        """
+        stats = self.stats
+        return (
+            f"Cache: {stats['requests']} requests, {stats['hits']} hits, {stats['misses']} misses, "
+            f"{stats['not_modified']} not modified (304), {stats['unchanged']} unchanged bodies, "
+            f"{stats['evictions']} evictions, {stats['bytes_downloaded']} bytes downloaded, "
+            f"{stats['bytes_saved']} bytes saved"
+        )
@@ -0,0 +1,184 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from boilerplate import DEFAULT_TEMPLATE_PATH, load_template
+from dedup import NearDuplicateIndex
+from instrumentation import STAGES, StageProfiler
+from manifest import DEFAULT_MANIFEST_PATH, load_manifest, save_manifest
+from process import DEFAULT_CHUNK_SIZE, process_categories, redundant_end, redundant_start
+from records import iter_input_records
+from routing import CategoryRouter
+
+# Executors the pages can be cleaned on
+EXECUTORS = ["serial", "thread", "process"]
+
+# Default settings of a pipeline run
+DEFAULT_CONFIG = {
+    "crawl": False,
+    "seed_file": "assignment.html",
+    "crawl_workers": 8,
+    "backend": None,
+    "records_file": "assignment_test.jsonl",
+    "input": None,
+    "output_dir": ".",
+    "template": DEFAULT_TEMPLATE_PATH,
+    "manifest": DEFAULT_MANIFEST_PATH,
+    "aliases": "aliases.json",
+    "executor": "serial",
+    "workers": None,
+    "chunk_size": DEFAULT_CHUNK_SIZE,
+    "report": None,
+    "profile_stage": None,
+}
+
+
+# Function to create the executor the pages are cleaned on
+def create_executor(kind, workers=None):
+    """
+    Create a thread or process pool to clean pages on.
+
+    Args:
+        kind (str): One of `EXECUTORS`.
+        workers (int, optional): Number of threads or processes, defaults to the number of cores.
+
+    Returns:
+        concurrent.futures.Executor: The pool, or None to clean in the calling thread.
+    """
+    if kind not in EXECUTORS:
+        raise ValueError(f"Unknown executor {kind!r}, expected one of {', '.join(EXECUTORS)}")
+    if kind == "serial":
+        return None
+    workers = workers or os.cpu_count() or 1
+    if kind == "thread":
+        return ThreadPoolExecutor(max_workers=workers)
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+# Function to run the whole pipeline: optionally crawl, then clean and save every category
+def run(config=None):
+    """
+    Run the pipeline with the given settings.
+
+    Nothing is read or written until this is called, so the pipeline can be
+    imported and run repeatedly from a service or a benchmark.
+
+    Args:
+        config (dict, optional): Settings overriding `DEFAULT_CONFIG`:
+            `crawl` (crawl `seed_file` into `records_file` first, with
+            `crawl_workers` fetch threads and the HTML parser `backend`),
+            `input` (records to clean, by default `records_file` if it
+            exists and assignment_test.json otherwise), `output_dir` (directory of the category files, and of
+            the `template`, `manifest` and `aliases` files unless those are
+            absolute; set any of them to None to turn learning the template,
+            incremental cleaning or near-duplicate removal off), `executor`
+            and `workers` (see `create_executor`), `chunk_size` (pages per
+            chunk sent to the executor), `report` and `profile_stage` (see
+            `instrumentation.StageProfiler`).
+
+    Returns:
+        dict: The `input` file, the number of pages saved per category under
+            `categories`, the number of `aliases` and the run time in `seconds`.
+    """
+    config = {**DEFAULT_CONFIG, **(config or {})}
+    started = time.perf_counter()
+    output_dir = config["output_dir"]
+
+    def output_path(key):
+        return os.path.normpath(os.path.join(output_dir, config[key])) if config[key] else None
+
+    profiler = StageProfiler(config["profile_stage"]) if config["report"] else None
+
+    if config["crawl"]:
+        from scrape import scrape
+
+        scrape(config["seed_file"], config["records_file"], config["crawl_workers"], profiler, config["backend"])
+
+    # Read the JSONL records written by scrape.py, or the legacy JSON file
+    input_file = config["input"]
+    if input_file is None:
+        input_file = config["records_file"] if os.path.exists(config["records_file"]) else "assignment_test.json"
+
+    # Learn the shared header and footer of the pages, reusing the cached template
+    start_pattern, end_pattern = redundant_start, redundant_end
+    if config["template"]:
+        template = load_template((record["text"] for record in iter_input_records(input_file)),
+                                 output_path("template"))
+        start_pattern = template["start"] or redundant_start
+        end_pattern = template["end"] or redundant_end
+
+    # Route, clean and save every category in one pass over the records, cleaning
+    # only the pages that changed since the last run and keeping one canonical
+    # copy of every cluster of near-duplicate pages
+    manifest = load_manifest(output_path("manifest")) if config["manifest"] else None
+    dedup_index = NearDuplicateIndex() if config["aliases"] else None
+    executor = create_executor(config["executor"], config["workers"])
+    window = 2 * (config["workers"] or os.cpu_count() or 1)
+    try:
+        counts = process_categories(
+            iter_input_records(input_file), CategoryRouter(), start_pattern, end_pattern, manifest, dedup_index,
+            profiler, executor, config["chunk_size"], window, output_dir,
+        )
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    if manifest is not None:
+        save_manifest(manifest, output_path("manifest"))
+
+    # Save the near-duplicate pages and the canonical page each one is an alias of
+    if dedup_index is not None:
+        with open(output_path("aliases"), "w", encoding="utf-8") as json_file:
+            json.dump(dedup_index.aliases, json_file, indent=4)
+        print(f"{len(dedup_index.aliases)} near-duplicate pages saved to {output_path('aliases')}")
+
+    if profiler is not None:
+        profiler.save(config["report"])
+        print(profiler.summary())
+        print(f"Run report saved to {config['report']}")
+
+    return {
+        "input": input_file,
+        "categories": counts,
+        "aliases": len(dedup_index.aliases) if dedup_index is not None else 0,
+        "seconds": time.perf_counter() - started,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Clean the scraped pages and save them per category.")
+    parser.add_argument("--crawl", action="store_true", help="crawl the pages linked from the seed file first")
+    parser.add_argument("--seed-file", default=DEFAULT_CONFIG["seed_file"])
+    parser.add_argument("--crawl-workers", type=int, default=DEFAULT_CONFIG["crawl_workers"])
+    parser.add_argument("--backend", help="HTML parser backend used when crawling, defaults to bs4")
+    parser.add_argument("--input", help="records to clean, a .jsonl file or a {url: text} .json file")
+    parser.add_argument("--output-dir", default=DEFAULT_CONFIG["output_dir"])
+    parser.add_argument("--no-incremental", action="store_true", help="clean every page instead of only changed ones")
+    parser.add_argument("--no-dedup", action="store_true", help="keep near-duplicate pages")
+    parser.add_argument("--executor", choices=EXECUTORS, default=DEFAULT_CONFIG["executor"])
+    parser.add_argument("--workers", type=int, help="threads or processes to clean on, defaults to the number of cores")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CONFIG["chunk_size"])
+    parser.add_argument("--report", help="save a JSON report of per-stage timings and memory to this path")
+    parser.add_argument("--profile-stage", choices=STAGES, help="also export cProfile statistics for this stage")
+    args = parser.parse_args(argv)
+
+    return run({
+        "crawl": args.crawl,
+        "seed_file": args.seed_file,
+        "crawl_workers": args.crawl_workers,
+        "backend": args.backend,
+        "input": args.input,
+        "output_dir": args.output_dir,
+        "manifest": None if args.no_incremental else DEFAULT_CONFIG["manifest"],
+        "aliases": None if args.no_dedup else DEFAULT_CONFIG["aliases"],
+        "executor": args.executor,
+        "workers": args.workers,
+        "chunk_size": args.chunk_size,
+        "report": args.report,
+        "profile_stage": args.profile_stage,
+    })
+
+
+if __name__ == "__main__":
+    main()
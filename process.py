@@ -1,5 +1,147 @@
 import json
+import os
 import re
+import time
+from collections import deque
+from functools import lru_cache
+from records import JsonDictWriter, hash_text, iter_json_dict
+from manifest import config_hash
+from instrumentation import timed
+
+# Characters that re.IGNORECASE folds onto letters with a different lowercase
+# form (e.g. "ſ" matches "s"), so str.lower() alone cannot find their matches
+CASE_VARIANTS = re.compile(
+    "[\xb5\u0131\u017f\u0345\u0390\u0392\u0395\u0398\u0399\u039a\u039c\u03a0\u03a1\u03a3\u03a6"
+    "\u03b0\u03b2\u03b5\u03b8\u03b9\u03ba\u03bc\u03c0\u03c1\u03c2\u03c3\u03c6\u03d0\u03d1\u03d5"
+    "\u03d6\u03f0\u03f1\u03f4\u03f5\u0412\u0414\u041e\u0421\u0422\u042a\u0432\u0434\u043e\u0441"
+    "\u0442\u044a\u0462\u0463\u1c80-\u1c88\u1e60\u1e61\u1e9b\u1fbe\u1fd3\u1fe3\ua64a\ua64b\ufb05\ufb06]"
+)
+NON_ALPHANUMERIC = re.compile(r'[^\w\s]+')
+
+# Define the default redundant start and end patterns, used when no template can be learned
+redundant_start = "Airport Changi Sites Airport Corporate Careers CAI Jewel Now Boarding Fly Fly Flight Information Arrival Flight Listing Departure Flight Listing Freighter Flight Listing Arrival Guide Entry Requirements (ICA) Immigration Clearance Customs Declaration Baggage Services Lost Baggage Passenger Meeting Services Leaving Changi Airport Getting Started in Singapore Departure Guide Travel Advisories Pre-flight Check Getting to Changi Airport Early Check-in Fast Check-in Immigration Clearance Tax Refund Security Screening and Baggage Restrictions Transiting Guide Free Singapore Tours Visa-free Transit Facility Transit Hotels Lounges Airline Lounges Pay-per-use Lounges Free-to-use Rest Areas Shower and Spa Services Airline Information Passenger Airline Information Freighter Airline Information At Changi At Changi Map Terminal Guides Terminal 1 Terminal 2 Terminal 3 Terminal 4 Transport and Directions Transfer Between Changi Terminals and Jewel Getting to Changi Airport Leaving Changi Airport Coach to Johor Bahru Parking Special Assistance Travelling with Children Persons with Reduced Mobility Persons with Invisible Disability Medical Care Facilities & Services Amenities Assistance Baggage Digital Travel Services Facilities Health & Wellness Hotels Lounges Other Services Transportation Hotels Crowne Plaza Changi Airport Transit Hotels YOTEL AIR Singapore Changi Airport Jewel Changi Airport Plan Your Visit Attractions Shop Dine Stay Plan Your Events Corporate Weddings Birthdays Dine & Shop Dine & Shop Dining Cafés Fast Food Fine Dining Food Court Homegrown Brands Pubs & Bars Quick Bites Restaurants Shopping Beauty Children & Maternity Deli & Confectionary Electronics Entertainment Fashion & Accessories Health & Wellness Home & Living Homegrown Brands Lifestyle Luxury Optical Souvenirs, Gifts & Books Sports Supermarket & Convenience Travel Watches & Jewellery Wine & Spirits Changi Pay Changi Rewards Shopping Concierge Shop Online Experience Experience Attractions Art Gardens Play Experiences for Kids Attractions ChangiVerse Activity Videos Things to Do Learning Journeys (For Students) Free Tours Free Singapore Tour Changi Airport Tours Jewel Changi Airport Tours Happenings Happenings Events Changi Festive Village Pop-up Stores Promotions Changi Rewards Member's Specials Changi Rewards Changi Rewards Benefits & Privileges Membership Benefits Parking Privileges Changi Rewards Catalogue Specials Events Monarch About Monarch Benefits & Privileges Monarch Concierge Monarch Parking Monarch FAQs Help FAQs Terms and Conditions Feedback Form Chat App & Help App & Help Assistance Lost & Found Special Assistance FAQs Changi App Travel Tips Baggage Tracker Book, Redeem & Play Dine with Changi App Changi Pay Changi App Help Centre The Great Changi Appscapade Space APPxplorer Download Changi App Contact Information Login/Sign Up Dashboard My Rewards Logout en zh All Changi Sites: Language Select: Logout"
+redundant_end = "Fly Flight Information Airline Information"
+
+# Default number of pages per chunk, and of chunks in flight, when cleaning on an executor
+DEFAULT_CHUNK_SIZE = 256
+DEFAULT_WINDOW = 8
+
+
+# Class cleaning page text with patterns compiled once
+class TextCleaner:
+    """
+    Clean page text by removing a redundant start and end pattern.
+
+    The patterns are compiled once when the cleaner is created. The start and
+    end markers are located with str.find on the lowercased text and removed by
+    slicing; the compiled regular expressions are only used for text where
+    lowercasing cannot reproduce re.IGNORECASE (see `CASE_VARIANTS`) or where
+    the end pattern has to stop at a newline. The output is identical to the
+    step-by-step regex version of `clean_text`.
+
+    Args:
+        redundant_start (str): The redundant starting pattern to remove.
+        redundant_end (str): The redundant ending pattern to remove.
+    """
+
+    def __init__(self, redundant_start, redundant_end):
+        self.redundant_start = redundant_start
+        self.redundant_end = redundant_end
+        self.start_pattern = re.compile(re.escape(redundant_start), re.IGNORECASE)
+        self.end_pattern = re.compile(f"{re.escape(redundant_end)}.*")
+        self.start_key = redundant_start.lower()
+        self.find_start = (
+            bool(redundant_start)
+            and len(self.start_key) == len(redundant_start)
+            and not CASE_VARIANTS.search(redundant_start)
+        )
+
+    def remove_start(self, content):
+        """
+        Remove every case-insensitive occurrence of the redundant start pattern.
+
+        Args:
+            content (str): The raw content string.
+
+        Returns:
+            str: The content without the start pattern.
+        """
+        if not self.find_start:
+            return self.start_pattern.sub("", content)
+
+        lowered = content.lower()
+        if len(lowered) != len(content) or CASE_VARIANTS.search(content):
+            return self.start_pattern.sub("", content)
+
+        index = lowered.find(self.start_key)
+        if index < 0:
+            return content
+
+        parts = []
+        position = 0
+        while index >= 0:
+            parts.append(content[position:index])
+            position = index + len(self.start_key)
+            index = lowered.find(self.start_key, position)
+        parts.append(content[position:])
+        return "".join(parts)
+
+    def remove_end(self, content):
+        """
+        Remove the redundant end pattern and everything after it on the same line.
+
+        Args:
+            content (str): The content string.
+
+        Returns:
+            str: The content cut at the end pattern.
+        """
+        if not self.redundant_end or "\n" in content:
+            return self.end_pattern.sub("", content)
+
+        index = content.find(self.redundant_end)
+        return content if index < 0 else content[:index]
+
+    def clean(self, content):
+        """
+        Clean the text by removing redundant start and end patterns, and applying additional text cleaning.
+
+        Args:
+            content (str): The raw content string.
+
+        Returns:
+            str: The cleaned content.
+        """
+        content = self.remove_end(self.remove_start(content))
+
+        # Normalize whitespace (str.split uses the same whitespace as \s), then
+        # remove non-alphanumeric characters (except spaces)
+        content = " ".join(content.split())
+        content = NON_ALPHANUMERIC.sub("", content)
+
+        # No backslashes are left, so decoding unicode escapes only reinterprets
+        # the UTF-8 bytes as Latin-1, which is a no-op for ASCII text
+        if not content.isascii():
+            content = content.encode("utf-8").decode("latin-1")
+
+        return content
+
+
+# Function to get a cleaner for a pair of patterns, built once per pair
+@lru_cache(maxsize=32)
+def get_cleaner(redundant_start, redundant_end):
+    """
+    Return the compiled cleaner for a start and end pattern.
+
+    Args:
+        redundant_start (str): The redundant starting pattern to remove.
+        redundant_end (str): The redundant ending pattern to remove.
+
+    Returns:
+        TextCleaner: The cleaner, shared between calls with the same patterns.
+    """
+    return TextCleaner(redundant_start, redundant_end)
+
 
 # Define the function to clean text
 def clean_text(content, redundant_start, redundant_end):
@@ -14,22 +156,7 @@ def clean_text(content, redundant_start, redundant_end):
     Returns:
         str: The cleaned content.
     """
-    # Step 1: Remove redundant starting pattern
-    content = re.sub(re.escape(redundant_start), "", content, flags=re.IGNORECASE)
-    
-    # Step 2: Remove redundant ending pattern (everything after it)
-    content = re.sub(f"{re.escape(redundant_end)}.*", "", content)
-    
-    # Step 3: Normalize whitespace (replace multiple spaces with a single space)
-    content = re.sub(r'\s+', ' ', content).strip()
-    
-    # Step 4: Remove non-alphanumeric characters (except spaces)
-    content = re.sub(r'[^\w\s]', '', content)
-    
-    # Step 5: Decode unicode escape sequences
-    content = bytes(content, "utf-8").decode("unicode_escape")
-    
-    return content
+    return get_cleaner(redundant_start, redundant_end).clean(content)
 
 # Define a function to clean the data and save it
 def process_and_save(data, hrefs, redundant_start, redundant_end, output_filename):
@@ -44,10 +171,11 @@ def process_and_save(data, hrefs, redundant_start, redundant_end, output_filenam
         redundant_end (str): The redundant ending pattern to remove.
         output_filename (str): The name of the output file to save the cleaned data.
     """
+    cleaner = get_cleaner(redundant_start, redundant_end)
     cleaned_data = {}
     
     for href in hrefs:
-        cleaned_data[href] = clean_text(data[href], redundant_start, redundant_end)
+        cleaned_data[href] = cleaner.clean(data[href])
 
     # Save the cleaned data into a JSON file
     with open(output_filename, "w", encoding="utf-8") as json_file:
@@ -55,31 +183,313 @@ def process_and_save(data, hrefs, redundant_start, redundant_end, output_filenam
 
     print(f"Data cleaned and saved to {output_filename}")
 
-# Load the data from JSON file
-with open("assignment_test.json", "r", encoding="utf-8") as file:
-    data = json.load(file)
+# Class reading a previously saved category file forward, one page at a time
+class PreviousOutput:
+    """
+    Cursor over the cleaned pages saved for a category by an earlier run.
 
-# Categorize the hrefs
-hrefs_fly = [h for h in data.keys() if "https://www.changiairport.com/in/en/fly" in h]
-hrefs_at_changi = [h for h in data.keys() if "https://www.changiairport.com/in/en/at-changi" in h]
-hrefs_dine_and_shop = [h for h in data.keys() if "https://www.changiairport.com/in/en/dine-and-shop" in h]
-hrefs_experience = [h for h in data.keys() if "https://www.changiairport.com/in/en/experience" in h]
-hrefs_happenings = [h for h in data.keys() if "https://www.changiairport.com/in/en/happenings" in h]
-hrefs_rewards = [h for h in data.keys() if "https://www.changiairport.com/in/en/rewards" in h]
-hrefs_help = [h for h in data.keys() if "https://www.changiairport.com/in/en/help" in h]
+    Pages are looked up in the order they were saved, which is the order an
+    unchanged input yields them in, so the file is read once and only the
+    current entry is held in memory. Entries passed over belong to pages
+    that changed or were removed. A page looked up out of order, or a file
+    that cannot be read line by line, gives None and the page is cleaned
+    again instead.
 
-# Define the redundant start and end patterns for each category
-redundant_start = "Airport Changi Sites Airport Corporate Careers CAI Jewel Now Boarding Fly Fly Flight Information Arrival Flight Listing Departure Flight Listing Freighter Flight Listing Arrival Guide Entry Requirements (ICA) Immigration Clearance Customs Declaration Baggage Services Lost Baggage Passenger Meeting Services Leaving Changi Airport Getting Started in Singapore Departure Guide Travel Advisories Pre-flight Check Getting to Changi Airport Early Check-in Fast Check-in Immigration Clearance Tax Refund Security Screening and Baggage Restrictions Transiting Guide Free Singapore Tours Visa-free Transit Facility Transit Hotels Lounges Airline Lounges Pay-per-use Lounges Free-to-use Rest Areas Shower and Spa Services Airline Information Passenger Airline Information Freighter Airline Information At Changi At Changi Map Terminal Guides Terminal 1 Terminal 2 Terminal 3 Terminal 4 Transport and Directions Transfer Between Changi Terminals and Jewel Getting to Changi Airport Leaving Changi Airport Coach to Johor Bahru Parking Special Assistance Travelling with Children Persons with Reduced Mobility Persons with Invisible Disability Medical Care Facilities & Services Amenities Assistance Baggage Digital Travel Services Facilities Health & Wellness Hotels Lounges Other Services Transportation Hotels Crowne Plaza Changi Airport Transit Hotels YOTEL AIR Singapore Changi Airport Jewel Changi Airport Plan Your Visit Attractions Shop Dine Stay Plan Your Events Corporate Weddings Birthdays Dine & Shop Dine & Shop Dining Cafés Fast Food Fine Dining Food Court Homegrown Brands Pubs & Bars Quick Bites Restaurants Shopping Beauty Children & Maternity Deli & Confectionary Electronics Entertainment Fashion & Accessories Health & Wellness Home & Living Homegrown Brands Lifestyle Luxury Optical Souvenirs, Gifts & Books Sports Supermarket & Convenience Travel Watches & Jewellery Wine & Spirits Changi Pay Changi Rewards Shopping Concierge Shop Online Experience Experience Attractions Art Gardens Play Experiences for Kids Attractions ChangiVerse Activity Videos Things to Do Learning Journeys (For Students) Free Tours Free Singapore Tour Changi Airport Tours Jewel Changi Airport Tours Happenings Happenings Events Changi Festive Village Pop-up Stores Promotions Changi Rewards Member's Specials Changi Rewards Changi Rewards Benefits & Privileges Membership Benefits Parking Privileges Changi Rewards Catalogue Specials Events Monarch About Monarch Benefits & Privileges Monarch Concierge Monarch Parking Monarch FAQs Help FAQs Terms and Conditions Feedback Form Chat App & Help App & Help Assistance Lost & Found Special Assistance FAQs Changi App Travel Tips Baggage Tracker Book, Redeem & Play Dine with Changi App Changi Pay Changi App Help Centre The Great Changi Appscapade Space APPxplorer Download Changi App Contact Information Login/Sign Up Dashboard My Rewards Logout en zh All Changi Sites: Language Select: Logout"
-redundant_end = "Fly Flight Information Airline Information"
+    Args:
+        output_filename (str): The category's output file.
+    """
+
+    def __init__(self, output_filename):
+        self.entries = iter_json_dict(output_filename) if os.path.exists(output_filename) else iter(())
+
+    def get(self, url):
+        """
+        Return the saved cleaned text of a page, skipping the entries before it.
+
+        Args:
+            url (str): The page URL.
+
+        Returns:
+            str: The saved cleaned text, or None if it is not found further on in the file.
+        """
+        try:
+            for key, content in self.entries:
+                if key == url:
+                    return content
+        except ValueError:
+            pass
+        self.close()
+        return None
+
+    def close(self):
+        """
+        Close the file.
+        """
+        if hasattr(self.entries, "close"):
+            self.entries.close()
+        self.entries = iter(())
+
+
+# Function to clean a chunk of pages, run in the worker threads or processes of an executor
+def clean_chunk(redundant_start, redundant_end, texts):
+    """
+    Clean a chunk of page texts and time each one.
+
+    Args:
+        redundant_start (str): The redundant starting pattern to remove.
+        redundant_end (str): The redundant ending pattern to remove.
+        texts (list): The raw page texts.
+
+    Returns:
+        list: The cleaned text and the seconds it took, for every page.
+    """
+    cleaner = get_cleaner(redundant_start, redundant_end)
+    results = []
+    for text in texts:
+        start = time.perf_counter()
+        cleaned = cleaner.clean(text)
+        results.append((cleaned, time.perf_counter() - start))
+    return results
+
+
+# Function to clean the pages that need it, a chunk at a time on an executor
+def iter_cleaned_pages(pages, redundant_start, redundant_end, executor=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                       window=DEFAULT_WINDOW, profiler=None):
+    """
+    Fill in the cleaned `content` of every page that has none, keeping the input order.
+
+    Without an executor the pages are cleaned one by one as they are read.
+    With one, pages are grouped in chunks of `chunk_size` and every chunk is
+    cleaned by `clean_chunk` on the executor, with at most `window` chunks in
+    flight so memory stays bounded.
+
+    Args:
+        pages (iterable): Page dicts with `url`, `text` and `content` keys, and
+            `skip_clean` set for pages that must not be cleaned yet.
+        redundant_start (str): The redundant starting pattern to remove.
+        redundant_end (str): The redundant ending pattern to remove.
+        executor (concurrent.futures.Executor, optional): Thread or process pool to clean in.
+        chunk_size (int): Number of pages per chunk.
+        window (int): Maximum number of chunks being cleaned at once.
+        profiler (StageProfiler, optional): Profiler timing the clean stage.
+
+    Yields:
+        dict: Each page, with `cleaned` set if its content was cleaned here.
+    """
+    def needs_clean(page):
+        return page["content"] is None and not page["skip_clean"]
+
+    if executor is None:
+        cleaner = get_cleaner(redundant_start, redundant_end)
+        for page in pages:
+            if needs_clean(page):
+                with timed(profiler, "clean", page["url"]) as span:
+                    span["bytes"] = len(page["text"])
+                    page["content"] = cleaner.clean(page["text"])
+                page["cleaned"] = True
+            yield page
+        return
+
+    def finish(chunk, todo, future):
+        for page, (content, seconds) in zip(todo, future.result()):
+            page["content"] = content
+            page["cleaned"] = True
+            if profiler is not None:
+                profiler.record("clean", page["url"], seconds, len(page["text"]))
+        return chunk
+
+    in_flight = deque()
+    chunk = []
+    for page in pages:
+        chunk.append(page)
+        if len(chunk) < chunk_size:
+            continue
+        todo = [page for page in chunk if needs_clean(page)]
+        future = executor.submit(clean_chunk, redundant_start, redundant_end, [page["text"] for page in todo])
+        in_flight.append((chunk, todo, future))
+        chunk = []
+        if len(in_flight) >= window:
+            yield from finish(*in_flight.popleft())
+
+    if chunk:
+        todo = [page for page in chunk if needs_clean(page)]
+        future = executor.submit(clean_chunk, redundant_start, redundant_end, [page["text"] for page in todo])
+        in_flight.append((chunk, todo, future))
+    while in_flight:
+        yield from finish(*in_flight.popleft())
+
+
+# Define a function to clean every category and save them all in one sweep
+def process_categories(records, router, redundant_start, redundant_end, manifest=None, dedup_index=None,
+                       profiler=None, executor=None, chunk_size=DEFAULT_CHUNK_SIZE, window=DEFAULT_WINDOW,
+                       output_dir="."):
+    """
+    Route every page record to its category in one pass, clean the content and
+    stream it into the category's JSON file.
+
+    All category files are open at the same time and each page is written as
+    soon as it is cleaned, so memory stays flat however many pages there are.
+    With an executor, chunks of pages from every category are cleaned in
+    parallel (see `iter_cleaned_pages`) while the pages are still written in
+    input order, so the output does not depend on the executor.
+
+    With a manifest from the previous run, only pages whose raw text hash,
+    category or cleaning patterns changed are cleaned again; the cleaned text
+    of every other page is copied from the previous output, which is read
+    forward alongside the input (see `PreviousOutput`) rather than loaded.
+    Category files whose pages are all unchanged are left untouched. The
+    manifest is updated in place for the next run.
+
+    With a near-duplicate index, only the canonical page of each cluster of
+    near-identical cleaned pages is saved; the others are recorded as its
+    aliases in the index.
+
+    Args:
+        records (iterable): Page records with `url` and `text` keys, see `records.iter_input_records`.
+        router (CategoryRouter): The router assigning hrefs to categories.
+        redundant_start (str): The redundant starting pattern to remove.
+        redundant_end (str): The redundant ending pattern to remove.
+        manifest (dict, optional): The manifest loaded with `manifest.load_manifest`.
+        dedup_index (NearDuplicateIndex, optional): Index used to drop near-duplicate pages.
+        profiler (StageProfiler, optional): Profiler timing the clean and save stages.
+        executor (concurrent.futures.Executor, optional): Thread or process pool to clean in.
+        chunk_size (int): Number of pages per chunk sent to the executor.
+        window (int): Maximum number of chunks being cleaned at once.
+        output_dir (str): Directory of the category files.
+
+    Returns:
+        dict: Category name to the number of pages saved for it.
+    """
+    cleaner = get_cleaner(redundant_start, redundant_end)
+    config = config_hash(redundant_start, redundant_end)
+    previous_pages = {}
+    if manifest is not None and manifest["config"] == config:
+        previous_pages = manifest["pages"]
+
+    # Signatures stored by the previous run are reused if they were computed the same way
+    dedup_settings = dedup_index.settings() if dedup_index is not None else None
+    reuse_signatures = dedup_settings is not None and manifest is not None and manifest.get("dedup") == dedup_settings
+
+    # The order in which each category's pages were saved last time
+    previous_order = {name: [] for name in router.categories}
+    for url, entry in previous_pages.items():
+        if entry["category"] in previous_order and not entry.get("alias_of"):
+            previous_order[entry["category"]].append(url)
+
+    output_paths = {
+        name: os.path.normpath(os.path.join(output_dir, category["output"]))
+        for name, category in router.categories.items()
+    }
+    writers = {name: JsonDictWriter(path + ".tmp") for name, path in output_paths.items()}
+    written = {name: [] for name in router.categories}
+    changed = set()
+    previous_outputs = {}
+    pages = {}
+    cleaned_count = 0
+
+    # Look up what each page was last time, and reuse its cleaned text if it is unchanged
+    def plan(record):
+        url = record["url"]
+        name = router.route(url)
+        text_hash = record.get("hash") or hash_text(record["text"])
+        entry = previous_pages.get(url)
+        unchanged = entry is not None and entry["hash"] == text_hash and entry["category"] == name
+
+        content = None
+        if unchanged and not entry.get("alias_of"):
+            if name not in previous_outputs:
+                previous_outputs[name] = PreviousOutput(output_paths[name])
+            content = previous_outputs[name].get(url)
+
+        signature = None
+        if unchanged and reuse_signatures and entry.get("signature"):
+            signature = tuple(entry["signature"])
+
+        # An unchanged alias with a stored signature is only cleaned if it is no longer a near-duplicate
+        skip_clean = signature is not None and bool(entry.get("alias_of"))
+        return {"url": url, "text": record["text"], "name": name, "hash": text_hash, "entry": entry,
+                "unchanged": unchanged, "content": content, "signature": signature, "skip_clean": skip_clean,
+                "cleaned": False}
+
+    try:
+        planned = iter_cleaned_pages(
+            (plan(record) for record in records), redundant_start, redundant_end, executor, chunk_size, window,
+            profiler,
+        )
+        for page in planned:
+            url, name, entry, unchanged = page["url"], page["name"], page["entry"], page["unchanged"]
+
+            # Look an unchanged alias up by its stored signature, so it is only
+            # cleaned if it has no near-duplicate among this run's canonical pages
+            if page["skip_clean"]:
+                canonical = dedup_index.add(url, None, page["signature"])
+                if canonical != url:
+                    pages[url] = {"hash": page["hash"], "category": name, "alias_of": canonical,
+                                  "signature": entry["signature"]}
+                    if canonical != entry["alias_of"]:
+                        changed.add(name)
+                    continue
+                with timed(profiler, "clean", url) as span:
+                    span["bytes"] = len(page["text"])
+                    page["content"] = cleaner.clean(page["text"])
+                page["cleaned"] = True
+
+            content = page["content"]
+            if page["cleaned"]:
+                cleaned_count += 1
+
+            alias_of = None
+            pages[url] = {"hash": page["hash"], "category": name, "alias_of": None}
+            if dedup_index is not None:
+                signature = page["signature"] or dedup_index.signature(content)
+                canonical = dedup_index.add(url, content, signature)
+                alias_of = canonical if canonical != url else None
+                pages[url]["alias_of"] = alias_of
+                pages[url]["signature"] = list(signature)
+
+            if alias_of is None:
+                with timed(profiler, "save", url) as span:
+                    span["bytes"] = len(content)
+                    writers[name].write(url, content)
+                written[name].append(url)
+                if page["cleaned"]:
+                    changed.add(name)
+            elif not (unchanged and entry.get("alias_of") == alias_of):
+                changed.add(name)
+    except BaseException:
+        for name, writer in writers.items():
+            writer.close()
+            os.remove(output_paths[name] + ".tmp")
+        raise
+    finally:
+        for previous in previous_outputs.values():
+            previous.close()
+
+    # Replace only the category files whose pages changed, were added or were removed
+    for name, writer in writers.items():
+        writer.close()
+        output_filename = output_paths[name]
+        if name in changed or written[name] != previous_order[name] or not os.path.exists(output_filename):
+            os.replace(output_filename + ".tmp", output_filename)
+            print(f"Data cleaned and saved to {output_filename}")
+        else:
+            os.remove(output_filename + ".tmp")
+            print(f"Data unchanged in {output_filename}")
+
+    print(f"Cleaned {cleaned_count} pages, reused {len(pages) - cleaned_count} unchanged pages")
+
+    if manifest is not None:
+        manifest["config"] = config
+        manifest["dedup"] = dedup_settings
+        manifest["pages"] = pages
+
+    return {name: writer.count for name, writer in writers.items()}
+
+if __name__ == "__main__":
+    from pipeline import main
+
+    main()
 
-# Now apply the `process_and_save` function to each category
-process_and_save(data, hrefs_fly, redundant_start, redundant_end, "fly.json")
-process_and_save(data, hrefs_at_changi, redundant_start, redundant_end, "at_changi.json")
-process_and_save(data, hrefs_dine_and_shop, redundant_start, redundant_end, "dine_and_shop.json")
-process_and_save(data, hrefs_experience, redundant_start, redundant_end, "experience.json")
-process_and_save(data, hrefs_happenings, redundant_start, redundant_end, "happenings.json")
-process_and_save(data, hrefs_rewards, redundant_start, redundant_end, "rewards.json")
-process_and_save(data, hrefs_help , redundant_start, redundant_end, "help .json")
 
 
 
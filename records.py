@@ -0,0 +1,291 @@
+import argparse
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+
+# Suffix of the file a crawl writes to until it has finished
+PARTIAL_SUFFIX = ".partial"
+
+# Text saved for pages that could not be fetched, and the record statuses
+FAILED_TEXT = "Failed to retrieve content"
+STATUS_OK = "ok"
+STATUS_FAILED = "failed"
+
+
+# Function to hash the text of a page
+def hash_text(text):
+    """
+    Compute a stable hash of a page's text.
+
+    Args:
+        text (str): The page text.
+
+    Returns:
+        str: The hex SHA-256 digest of the UTF-8 encoded text.
+    """
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+# Function to build one page record
+def make_record(url, text, category=None, fetched_at=None, status=STATUS_OK):
+    """
+    Build the record written for one page.
+
+    Args:
+        url (str): The page URL.
+        text (str): The extracted text of the page.
+        category (str, optional): The category the page is routed to.
+        fetched_at (str, optional): ISO 8601 fetch time, defaults to now.
+        status (str): `STATUS_OK`, or `STATUS_FAILED` if the page could not be fetched.
+
+    Returns:
+        dict: The record with `url`, `category`, `text`, `fetched_at`, `hash` and `status` keys.
+    """
+    if fetched_at is None:
+        fetched_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    return {"url": url, "category": category, "text": text, "fetched_at": fetched_at, "hash": hash_text(text),
+            "status": status}
+
+
+# Function to tell whether a record is for a page that could not be fetched
+def is_failed(record):
+    """
+    Check whether a record stands for a failed fetch.
+
+    Records written before the `status` field existed are recognized by their text.
+
+    Args:
+        record (dict): The page record.
+
+    Returns:
+        bool: True if the page could not be fetched.
+    """
+    return record.get("status", STATUS_OK) == STATUS_FAILED or record["text"] == FAILED_TEXT
+
+
+# Function to stream records out of a JSONL file
+def iter_records(file_path):
+    """
+    Yield the records of a newline-delimited JSON file one at a time.
+
+    The last record may lack a trailing newline. If the last line is not valid
+    JSON, as when a crawl was cut off mid-write, it is skipped with a warning.
+
+    Args:
+        file_path (str): Path to the JSONL file.
+
+    Yields:
+        dict: Each record.
+    """
+    with open(file_path, "r", encoding="utf-8") as file:
+        for line in file:
+            if not line.strip():
+                continue
+            if line.endswith("\n"):
+                yield json.loads(line)
+                continue
+            # Only the last line can lack a newline
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                print(f"Skipping truncated last record in {file_path}")
+                continue
+            yield record
+
+
+# Function to stream records out of a JSONL file or a legacy JSON dict file
+def iter_input_records(file_path):
+    """
+    Yield page records from either a JSONL file or a legacy `{url: text}` JSON file.
+
+    Args:
+        file_path (str): Path to a .jsonl file, or a .json file written by `save_to_json`.
+
+    Yields:
+        dict: Each record. Records read from legacy files have no category or fetch time.
+    """
+    if file_path.endswith(".jsonl"):
+        yield from iter_records(file_path)
+        return
+
+    with open(file_path, "r", encoding="utf-8") as file:
+        data = json.load(file)
+    for url, text in data.items():
+        yield make_record(url, text, fetched_at="")
+
+
+# Class appending records to a JSONL file, one flushed line per record
+class RecordWriter:
+    """
+    Append records to a JSONL file so that a crashed run can be resumed.
+
+    Records are written to `<path>.partial`, one line each and flushed right
+    away. Opening the writer on an existing partial file keeps its complete
+    records (see `done_urls`) and drops a truncated last line as well as the
+    records of failed fetches, so a resumed crawl retries those pages.
+    `close()` moves the finished file to `path`.
+
+    Args:
+        file_path (str): Path of the finished JSONL file.
+    """
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.partial_path = file_path + PARTIAL_SUFFIX
+        self.done_urls = set()
+
+        if os.path.exists(self.partial_path):
+            kept = []
+            complete_size = 0
+            dropped = False
+            with open(self.partial_path, "rb") as file:
+                for line in file:
+                    if not line.endswith(b"\n"):
+                        break
+                    complete_size += len(line)
+                    if not line.strip():
+                        continue
+                    record = json.loads(line)
+                    if is_failed(record):
+                        dropped = True
+                        continue
+                    kept.append(line)
+                    self.done_urls.add(record["url"])
+
+            # Rewrite the file without the failed records, or just cut off the truncated line
+            if dropped:
+                with open(self.partial_path, "wb") as file:
+                    file.writelines(kept)
+            else:
+                with open(self.partial_path, "r+b") as file:
+                    file.truncate(complete_size)
+
+        self.file = open(self.partial_path, "a", encoding="utf-8", buffering=1)
+
+    def write(self, record):
+        """
+        Append one record as a single line.
+
+        Args:
+            record (dict): The record to write.
+        """
+        self.file.write(json.dumps(record) + "\n")
+        if not is_failed(record):
+            self.done_urls.add(record["url"])
+
+    def close(self):
+        """
+        Close the file and move it to its final path.
+        """
+        self.file.close()
+        os.replace(self.partial_path, self.file_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # Leave the partial file in place after an error so the run can resume
+        if exc_type is None:
+            self.close()
+        else:
+            self.file.close()
+
+
+# Class writing a `{key: value}` JSON object one entry at a time
+class JsonDictWriter:
+    """
+    Write a JSON object incrementally, byte-identical to `json.dump(data, file, indent=4)`
+    for a flat dict, without holding the dict in memory.
+
+    Args:
+        file_path (str): Path of the JSON file to write.
+    """
+
+    def __init__(self, file_path):
+        self.file = open(file_path, "w", encoding="utf-8")
+        self.count = 0
+
+    def write(self, key, value):
+        """
+        Write one entry of the object.
+
+        Args:
+            key (str): The entry key.
+            value: The JSON-serializable entry value.
+        """
+        self.file.write("{\n    " if self.count == 0 else ",\n    ")
+        self.file.write(f"{json.dumps(key)}: {json.dumps(value, indent=4)}")
+        self.count += 1
+
+    def close(self):
+        """
+        Close the object and the file.
+        """
+        self.file.write("{}" if self.count == 0 else "\n}")
+        self.file.close()
+
+
+# Function to stream the entries of a JSON object written by JsonDictWriter
+def iter_json_dict(file_path):
+    """
+    Yield the entries of a flat JSON object file one at a time, in file order.
+
+    The file must be laid out like `json.dump(data, file, indent=4)` output
+    for a dict of strings, as `JsonDictWriter` and the category files are:
+    one entry per line.
+
+    Args:
+        file_path (str): Path of the JSON file.
+
+    Yields:
+        tuple: Each key and its value.
+
+    Raises:
+        ValueError: If a line does not hold exactly one entry.
+    """
+    with open(file_path, "r", encoding="utf-8") as file:
+        for line in file:
+            line = line.strip()
+            if line in ("{", "}", "{}", ""):
+                continue
+            entry = json.loads("{" + line.rstrip(",") + "}")
+            if len(entry) != 1:
+                raise ValueError(f"Expected one entry per line in {file_path}")
+            yield next(iter(entry.items()))
+
+
+# Function to convert a legacy JSON file into JSONL records
+def convert_json_to_jsonl(json_path, jsonl_path, router=None):
+    """
+    Convert a `{url: text}` JSON file, such as assignment_test.json or a
+    category file, into a JSONL file of records.
+
+    Args:
+        json_path (str): Path of the JSON file to read.
+        jsonl_path (str): Path of the JSONL file to write.
+        router (CategoryRouter, optional): Router used to fill in each record's category.
+
+    Returns:
+        int: The number of records written.
+    """
+    count = 0
+    with open(jsonl_path, "w", encoding="utf-8") as file:
+        for record in iter_input_records(json_path):
+            if router is not None:
+                record["category"] = router.route(record["url"])
+            file.write(json.dumps(record) + "\n")
+            count += 1
+    return count
+
+
+if __name__ == "__main__":
+    from routing import CategoryRouter
+
+    parser = argparse.ArgumentParser(description="Convert a {url: text} JSON file into JSONL page records.")
+    parser.add_argument("json_path", nargs="?", default="assignment_test.json")
+    parser.add_argument("jsonl_path", nargs="?", default="assignment_test.jsonl")
+    args = parser.parse_args()
+
+    count = convert_json_to_jsonl(args.json_path, args.jsonl_path, CategoryRouter())
+    print(f"Converted {count} records from {args.json_path} to {args.jsonl_path}")
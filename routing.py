@@ -0,0 +1,77 @@
+# Table of categories: the URL prefix routed to each category and its output file
+CATEGORIES = [
+    {"name": "fly", "prefix": "https://www.changiairport.com/in/en/fly", "output": "fly.json"},
+    {"name": "at_changi", "prefix": "https://www.changiairport.com/in/en/at-changi", "output": "at_changi.json"},
+    {"name": "dine_and_shop", "prefix": "https://www.changiairport.com/in/en/dine-and-shop", "output": "dine_and_shop.json"},
+    {"name": "experience", "prefix": "https://www.changiairport.com/in/en/experience", "output": "experience.json"},
+    {"name": "happenings", "prefix": "https://www.changiairport.com/in/en/happenings", "output": "happenings.json"},
+    {"name": "rewards", "prefix": "https://www.changiairport.com/in/en/rewards", "output": "rewards.json"},
+    {"name": "help", "prefix": "https://www.changiairport.com/in/en/help", "output": "help.json"},
+]
+
+# Category receiving every URL that matches none of the prefixes
+OTHER_CATEGORY = {"name": "other", "prefix": None, "output": "other.json"}
+
+# Trie key marking the node where a category prefix ends
+TERMINAL = ""
+
+
+# Class assigning URLs to categories with a prefix trie
+class CategoryRouter:
+    """
+    Route URLs to categories by the longest matching URL prefix.
+
+    The prefixes of the category table are stored in a character trie, so a
+    URL is routed in a single walk over its characters, however many
+    categories there are. URLs matching no prefix go to the "other" category.
+
+    Args:
+        categories (list): Category dicts with `name`, `prefix` and `output` keys.
+        other (dict): The category for unmatched URLs.
+    """
+
+    def __init__(self, categories=CATEGORIES, other=OTHER_CATEGORY):
+        self.categories = {category["name"]: category for category in categories}
+        self.categories[other["name"]] = other
+        self.other = other["name"]
+        self.root = {}
+
+        for category in categories:
+            node = self.root
+            for char in category["prefix"]:
+                node = node.setdefault(char, {})
+            node[TERMINAL] = category["name"]
+
+    def route(self, url):
+        """
+        Return the category of a URL.
+
+        Args:
+            url (str): The URL to route.
+
+        Returns:
+            str: The name of the category with the longest matching prefix, or "other".
+        """
+        name = self.other
+        node = self.root
+        for char in url:
+            node = node.get(char)
+            if node is None:
+                break
+            name = node.get(TERMINAL, name)
+        return name
+
+    def split(self, urls):
+        """
+        Group URLs by category in one pass, keeping their order.
+
+        Args:
+            urls (iterable): The URLs to route.
+
+        Returns:
+            dict: Category name to the list of its URLs, with every category present.
+        """
+        groups = {name: [] for name in self.categories}
+        for url in urls:
+            groups[self.route(url)].append(url)
+        return groups
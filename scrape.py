@@ -1,7 +1,33 @@
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit, urlunsplit
+from page_cache import PageCache
+from extractors import BACKENDS, DEFAULT_BACKEND, decode_html, get_backend
+from records import FAILED_TEXT, STATUS_FAILED, STATUS_OK, RecordWriter, make_record
+from routing import CategoryRouter
+from boilerplate import read_template
+from dedup import NearDuplicateIndex
+from process import get_cleaner, redundant_end, redundant_start
+from instrumentation import STAGES, StageProfiler, timed
+import argparse
 import json
+import os
 import re
+import threading
+import time
+
+# Default network settings used when fetching pages
+DEFAULT_TIMEOUT = 10
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF = 0.5
+DEFAULT_PER_HOST = 4
+
+# HTTP status codes that are worth retrying
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
 
 # Function to extract all href links from an HTML file
 def extract_hrefs(file_path):
@@ -24,45 +50,224 @@ def extract_hrefs(file_path):
     return hrefs
 
 
+# Function to normalize a link so that equivalent URLs compare equal
+def normalize_url(href, base_url=None):
+    """
+    Resolve a link against a base URL and normalize it.
+
+    The scheme and host are lowercased and the fragment is dropped, so that
+    links pointing at the same page map to the same string.
+
+    Args:
+        href (str): The link as written in the page.
+        base_url (str, optional): The URL of the page the link was found on.
+
+    Returns:
+        str: The absolute, normalized URL.
+    """
+    if base_url:
+        href = urljoin(base_url, href)
+    parts = urlsplit(href.strip())
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, parts.query, ""))
+
+
+# Class collecting <a href> values while the HTML is fed in chunks
+class HrefParser(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.hrefs = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag != "a":
+            return
+        href = None
+        for name, value in attrs:
+            if name == "href" and value is not None:
+                href = value
+        if href is not None and href.endswith(".html"):
+            self.hrefs.append(href)
+
+
+# Function to stream unique href links out of a large HTML file
+def iter_hrefs(file_path, base_url=None, chunk_size=64 * 1024):
+    """
+    Yield the unique href links ending with .html from an HTML file.
+
+    Unlike `extract_hrefs` the file is read and tokenized in chunks, so no
+    document tree is built and memory stays flat for large seed pages. Links
+    are resolved against `base_url`, normalized and yielded in the order they
+    first appear.
+
+    Args:
+        file_path (str): Path to the HTML file.
+        base_url (str, optional): URL used to resolve relative links.
+        chunk_size (int): Number of characters read per chunk.
+
+    Yields:
+        str: Each normalized link, once.
+    """
+    parser = HrefParser()
+    seen = set()
+
+    with open(file_path, "r", encoding="utf-8") as file:
+        while True:
+            chunk = file.read(chunk_size)
+            if chunk:
+                parser.feed(chunk)
+            else:
+                parser.close()
+
+            for href in parser.hrefs:
+                url = normalize_url(href, base_url)
+                if url not in seen:
+                    seen.add(url)
+                    yield url
+            parser.hrefs.clear()
+
+            if not chunk:
+                break
+
+
+# Class ordering the URLs to crawl, pushing back links into known duplicate clusters
+class Frontier:
+    """
+    Queue of URLs to crawl that deprioritizes likely near-duplicates.
+
+    Once a crawled page turns out to be a near-duplicate, the other pages in
+    its directory (e.g. locale variants or listing pages) are moved behind
+    every other URL. They are still crawled, just last. URLs are pulled from
+    `urls` only as they are crawled, so only the deferred ones are held in
+    memory.
+
+    Args:
+        urls (iterable): The URLs to crawl, in their initial order, e.g. the generator from `iter_hrefs`.
+    """
+
+    def __init__(self, urls):
+        self.urls = iter(urls)
+        self.deferred = deque()
+        self.duplicate_directories = set()
+
+    def defer_similar(self, url):
+        """
+        Deprioritize the not yet crawled URLs in the directory of a near-duplicate page.
+
+        Args:
+            url (str): The URL of the near-duplicate page.
+        """
+        self.duplicate_directories.add(url.rsplit("/", 1)[0])
+
+    def __iter__(self):
+        for url in self.urls:
+            if url.rsplit("/", 1)[0] in self.duplicate_directories:
+                self.deferred.append(url)
+            else:
+                yield url
+        while self.deferred:
+            yield self.deferred.popleft()
+
+
+# Function to create a session that reuses pooled connections
+def create_session(per_host=DEFAULT_PER_HOST):
+    """
+    Create a requests session with a keep-alive connection pool per host.
+
+    Args:
+        per_host (int): The number of pooled connections to keep for each host.
+
+    Returns:
+        requests.Session: The configured session.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=per_host)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Function to decide whether a failed request should be retried
+def is_retryable(error):
+    """
+    Check whether a request error is transient and worth retrying.
+
+    Args:
+        error (requests.exceptions.RequestException): The error raised by the request.
+
+    Returns:
+        bool: True for connection errors, timeouts and retryable status codes.
+    """
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    response = getattr(error, "response", None)
+    return response is not None and response.status_code in RETRY_STATUS_CODES
+
+
+# Function to send a GET request with timeouts and retries
+def fetch_url_response(url, session=None, timeout=DEFAULT_TIMEOUT, retries=0, backoff=DEFAULT_BACKOFF, headers=None):
+    """
+    Send a GET request and return the response.
+
+    Args:
+        url (str): The URL to fetch.
+        session (requests.Session, optional): Session to reuse connections from.
+        timeout (float): Seconds to wait for the server before giving up.
+        retries (int): How many times to retry transient failures.
+        backoff (float): Base delay in seconds, doubled after every retry.
+        headers (dict, optional): Extra request headers, e.g. conditional GET validators.
+
+    Returns:
+        requests.Response: The successful (2xx or 304) response, or None if failed.
+    """
+    client = session if session is not None else requests
+    for attempt in range(retries + 1):
+        try:
+            response = client.get(url, timeout=timeout, headers=headers)
+            response.raise_for_status()
+            return response
+        except requests.exceptions.RequestException as e:
+            if attempt < retries and is_retryable(e):
+                time.sleep(backoff * (2 ** attempt))
+                continue
+            print(f"Failed to fetch URL {url}: {e}")
+            return None
+
+
 # Function to fetch and parse text from a given URL
-def fetch_url_content(url):
+def fetch_url_content(url, session=None, timeout=DEFAULT_TIMEOUT, retries=0, backoff=DEFAULT_BACKOFF):
     """
     Send a GET request to fetch the webpage content.
 
     Args:
         url (str): The URL to fetch content from.
+        session (requests.Session, optional): Session to reuse connections from.
+        timeout (float): Seconds to wait for the server before giving up.
+        retries (int): How many times to retry transient failures.
+        backoff (float): Base delay in seconds, doubled after every retry.
     
     Returns:
         str: The raw HTML content from the page, or None if failed.
     """
-    try:
-        response = requests.get(url)
-        response.raise_for_status()
-        return response.content
-    except requests.exceptions.RequestException as e:
-        print(f"Failed to fetch URL {url}: {e}")
+    response = fetch_url_response(url, session, timeout, retries, backoff)
+    if response is None:
         return None
+    return response.content
 
 
 # Function to extract the clean text from the body of an HTML page
-def extract_text_from_html(html_content):
+def extract_text_from_html(html_content, backend=None):
     """
     Extract all visible text content from the HTML, excluding scripts and styles.
 
     Args:
         html_content (str): The raw HTML content to extract text from.
+        backend (str, optional): The HTML parser backend, see `extractors.get_backend`.
+            Defaults to bs4.
 
     Returns:
         str: The extracted clean text from the body of the HTML.
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
-
-    # Remove script and style elements
-    for element in soup(["script", "style"]):
-        element.decompose()
-
     # Extract the text from the body of the page
-    text = soup.body.get_text(separator=" ", strip=True)
+    text = get_backend(backend)(decode_html(html_content))
 
     # Clean the text by removing unwanted characters and extra spaces
     text = re.sub(r'\\u[0-9a-fA-F]{4}', '', text)  # Remove escape sequences
@@ -72,29 +277,189 @@ def extract_text_from_html(html_content):
     return text
 
 
+# Function to extract the text of a page and time it, run in the extraction process pool
+def extract_text_timed(html_content, backend=None):
+    """
+    Extract the visible text of a page and measure how long it took.
+
+    Args:
+        html_content (bytes or str): The raw HTML content.
+        backend (str, optional): The HTML parser backend.
+
+    Returns:
+        tuple: The extracted text and the seconds spent extracting it.
+    """
+    start = time.perf_counter()
+    text = extract_text_from_html(html_content, backend)
+    return text, time.perf_counter() - start
+
+
+# Function to fetch a URL and extract its text
+def fetch_and_extract(href, session=None, timeout=DEFAULT_TIMEOUT, retries=0, backoff=DEFAULT_BACKOFF, cache=None,
+                      backend=None, pool=None, profiler=None):
+    """
+    Fetch a single URL and extract its visible text.
+
+    When a cache is given the request is sent as a conditional GET, and the
+    cached text is reused if the server answers 304 or the body is unchanged.
+
+    Args:
+        href (str): The URL to fetch.
+        session (requests.Session, optional): Session to reuse connections from.
+        timeout (float): Seconds to wait for the server before giving up.
+        retries (int): How many times to retry transient failures.
+        backoff (float): Base delay in seconds, doubled after every retry.
+        cache (PageCache, optional): Cache of validators and previously extracted text.
+        backend (str, optional): The HTML parser backend used for extraction.
+        pool (concurrent.futures.Executor, optional): Process pool to run the extraction in.
+        profiler (StageProfiler, optional): Profiler timing the fetch and extract stages.
+
+    Returns:
+        str: The extracted text, or a failure message if the page could not be fetched.
+    """
+    print(f"Processing: {href}")
+    # Cached text is only reused if it was extracted with the same backend
+    backend = backend or DEFAULT_BACKEND
+    headers = cache.conditional_headers(href, backend) if cache is not None else None
+    with timed(profiler, "fetch", href) as span:
+        response = fetch_url_response(href, session, timeout, retries, backoff, headers)
+
+        if response is not None and response.status_code == 304 and cache is not None:
+            text = cache.not_modified(href, backend)
+            if text is not None:
+                return text
+            # The cached text is gone or from another backend, so fetch the page unconditionally
+            response = fetch_url_response(href, session, timeout, retries, backoff)
+
+        span["bytes"] = len(response.content) if response is not None else 0
+
+    if response is None or not response.content:
+        return FAILED_TEXT
+
+    if cache is not None:
+        text = cache.unchanged(href, response.content, backend)
+        if text is not None:
+            return text
+
+    # Parse time in a worker process is measured there, without the queueing and pickling
+    if pool is not None:
+        text, seconds = pool.submit(extract_text_timed, response.content, backend).result()
+        if profiler is not None:
+            profiler.record("extract", href, seconds, len(response.content))
+    else:
+        with timed(profiler, "extract", href) as span:
+            span["bytes"] = len(response.content)
+            text = extract_text_from_html(response.content, backend)
+    if cache is not None:
+        cache.store(href, response, text, backend)
+    return text
+
+
+# Function to stream the text of each href as soon as it is extracted
+def iter_text_for_hrefs(hrefs, workers=1, per_host=DEFAULT_PER_HOST, timeout=DEFAULT_TIMEOUT,
+                        retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF, preserve_order=True, cache=None,
+                        backend=None, extract_workers=0, profiler=None):
+    """
+    Fetch each URL and yield its extracted text.
+
+    With more than one worker the pages are fetched concurrently from a thread
+    pool sharing one session, and at most `per_host` requests run against the
+    same host at a time. Only a small window of pages is in flight at once, so
+    memory does not grow with the number of URLs. With `extract_workers` the
+    CPU-bound text extraction runs in a process pool so it scales across cores.
+
+    Args:
+        hrefs (iterable): URLs to extract text from, e.g. the generator from `iter_hrefs`.
+        workers (int): Number of pages to fetch at the same time.
+        per_host (int): Maximum number of concurrent requests per host.
+        timeout (float): Seconds to wait for the server before giving up.
+        retries (int): How many times to retry transient failures.
+        backoff (float): Base delay in seconds, doubled after every retry.
+        preserve_order (bool): Yield in input order instead of completion order.
+        cache (PageCache, optional): Cache used to send conditional GETs and reuse unchanged pages.
+        backend (str, optional): The HTML parser backend used for extraction.
+        extract_workers (int): Number of processes to extract text in, or 0 to extract in-line.
+        profiler (StageProfiler, optional): Profiler timing the fetch and extract stages.
+
+    Yields:
+        tuple: Each href and its extracted text.
+    """
+    session = create_session(per_host)
+    seen = set()
+    unique_hrefs = (href for href in hrefs if not (href in seen or seen.add(href)))
+    pool = ProcessPoolExecutor(max_workers=extract_workers) if extract_workers > 0 else None
+
+    def fetch(href):
+        return fetch_and_extract(href, session, timeout, retries, backoff, cache, backend, pool, profiler)
+
+    try:
+        if workers <= 1:
+            for href in unique_hrefs:
+                yield href, fetch(href)
+            return
+
+        host_limits = {}
+        host_limits_lock = threading.Lock()
+
+        def worker(href):
+            host = urlsplit(href).netloc
+            with host_limits_lock:
+                limit = host_limits.setdefault(host, threading.BoundedSemaphore(per_host))
+            with limit:
+                return href, fetch(href)
+
+        window = workers * 2
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            if preserve_order:
+                in_flight = deque()
+                for href in unique_hrefs:
+                    in_flight.append(executor.submit(worker, href))
+                    if len(in_flight) >= window:
+                        yield in_flight.popleft().result()
+                while in_flight:
+                    yield in_flight.popleft().result()
+            else:
+                in_flight = set()
+                for href in unique_hrefs:
+                    in_flight.add(executor.submit(worker, href))
+                    if len(in_flight) >= window:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            yield future.result()
+                for future in as_completed(in_flight):
+                    yield future.result()
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+
 # Function to extract all text for each href and store it in a dictionary
-def extract_text_for_hrefs(hrefs):
+def extract_text_for_hrefs(hrefs, workers=1, per_host=DEFAULT_PER_HOST, timeout=DEFAULT_TIMEOUT,
+                           retries=DEFAULT_RETRIES, backoff=DEFAULT_BACKOFF, preserve_order=True, cache=None,
+                           backend=None, extract_workers=0, profiler=None):
     """
     Extract text from each URL and store it in a dictionary.
 
+    See `iter_text_for_hrefs` for the concurrency options.
+
     Args:
         hrefs (list): List of URLs to extract text from.
+        workers (int): Number of pages to fetch at the same time.
+        per_host (int): Maximum number of concurrent requests per host.
+        timeout (float): Seconds to wait for the server before giving up.
+        retries (int): How many times to retry transient failures.
+        backoff (float): Base delay in seconds, doubled after every retry.
+        preserve_order (bool): Keep the output in input order instead of completion order.
+        cache (PageCache, optional): Cache used to send conditional GETs and reuse unchanged pages.
+        backend (str, optional): The HTML parser backend used for extraction.
+        extract_workers (int): Number of processes to extract text in, or 0 to extract in-line.
+        profiler (StageProfiler, optional): Profiler timing the fetch and extract stages.
 
     Returns:
         dict: A dictionary where keys are hrefs and values are extracted text.
     """
-    all_text = {}
-    for href in hrefs:
-        print(f"Processing: {href}")
-        html_content = fetch_url_content(href)
-        
-        if html_content:
-            text = extract_text_from_html(html_content)
-            all_text[href] = text
-        else:
-            all_text[href] = "Failed to retrieve content"
-    
-    return all_text
+    return dict(iter_text_for_hrefs(hrefs, workers, per_host, timeout, retries, backoff,
+                                    preserve_order, cache, backend, extract_workers, profiler))
 
 
 # Function to save data to a JSON file
@@ -110,19 +475,74 @@ def save_to_json(data, file_path):
         json.dump(data, json_file, indent=4)
 
 
-def scrape():
-    # Path to your HTML file
-    file_path = "assignment.html"
+# Function to crawl the links of assignment.html into JSONL page records
+def scrape(file_path="assignment.html", output_file="assignment_test.jsonl", workers=8, profiler=None, backend=None):
+    """
+    Crawl every page linked from an HTML file and save its text as JSONL records.
 
-    # Extract all href links from the HTML file
-    hrefs = extract_hrefs(file_path)
-    
-    # Extract the text for each href link
-    all_text = extract_text_for_hrefs(hrefs)
+    Args:
+        file_path (str): Path to the HTML file with the links to crawl.
+        output_file (str): Path of the JSONL file to write.
+        workers (int): Number of pages to fetch at the same time.
+        profiler (StageProfiler, optional): Profiler timing the crawl stages.
+        backend (str, optional): The HTML parser backend, see `extractors.get_backend`.
+    """
+    # Resume from the records of an interrupted run, if there are any
+    writer = RecordWriter(output_file)
+    if writer.done_urls:
+        print(f"Resuming after {len(writer.done_urls)} records")
 
-    # Save the extracted text to a JSON file
-    output_file = "assignment_test.json"
-    save_to_json(all_text, output_file)
+    # Stream the unique href links out of the HTML file into the crawl frontier
+    frontier = Frontier(href for href in iter_hrefs(file_path) if href not in writer.done_urls)
+
+    # Extract the text for each href link, revalidating pages cached by earlier runs
+    # and parsing pages in a process pool when there is more than one core
+    cores = os.cpu_count() or 1
+    cache = PageCache()
+    router = CategoryRouter()
+    pages = iter_text_for_hrefs(frontier, workers=workers, cache=cache, backend=backend,
+                                extract_workers=cores if cores > 1 else 0, profiler=profiler)
+
+    # Fingerprint pages without their boilerplate, using the template learned by process.py
+    template = read_template() or {"start": redundant_start, "end": redundant_end}
+    cleaner = get_cleaner(template["start"] or redundant_start, template["end"] or redundant_end)
+    dedup_index = NearDuplicateIndex()
+
+    # Write each page as a JSONL record as soon as it is extracted, and crawl
+    # links next to near-duplicate pages last. The cache index is saved even if
+    # the crawl is interrupted, so the texts already cached stay tracked
+    try:
+        with writer:
+            for href, text in pages:
+                status = STATUS_FAILED if text == FAILED_TEXT else STATUS_OK
+                record = make_record(href, text, router.route(href), status=status)
+                with timed(profiler, "save", href) as span:
+                    span["bytes"] = len(text)
+                    writer.write(record)
+                with timed(profiler, "fingerprint", href) as span:
+                    span["bytes"] = len(text)
+                    canonical = dedup_index.add(href, cleaner.clean(text))
+                if canonical != href:
+                    frontier.defer_similar(href)
+    finally:
+        # Stop the fetch threads before saving, so no page is stored after the index is written
+        pages.close()
+        cache.save()
+
+    print(cache.report())
     print(f"Data saved to {output_file}")
 
-scrape()
\ No newline at end of file
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Crawl the pages linked from assignment.html.")
+    parser.add_argument("--report", help="save a JSON report of per-stage timings and memory to this path")
+    parser.add_argument("--profile-stage", choices=STAGES, help="also export cProfile statistics for this stage")
+    parser.add_argument("--backend", choices=sorted(BACKENDS), help="HTML parser backend, defaults to bs4")
+    args = parser.parse_args()
+
+    profiler = StageProfiler(args.profile_stage) if args.report else None
+    scrape(profiler=profiler, backend=args.backend)
+    if profiler is not None:
+        profiler.save(args.report)
+        print(profiler.summary())
+        print(f"Run report saved to {args.report}")
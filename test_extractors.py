@@ -0,0 +1,20 @@
+import json
+
+import pytest
+
+from bench_extract import GOLDEN_URL, load_golden_page
+from extractors import BACKENDS
+from scrape import extract_text_from_html
+
+
+@pytest.fixture(scope="module")
+def golden():
+    with open("assignment_test.json", "r", encoding="utf-8") as file:
+        expected = json.load(file)[GOLDEN_URL]
+    return load_golden_page(), expected
+
+
+@pytest.mark.parametrize("name", sorted(BACKENDS))
+def test_backend_reproduces_stored_text(golden, name):
+    html_content, expected = golden
+    assert extract_text_from_html(html_content, name) == expected
@@ -0,0 +1,9 @@
+from instrumentation import percentile
+
+
+def test_percentile_uses_nearest_rank():
+    assert percentile([5, 1, 4, 2, 3], 0.50) == 3
+    assert percentile(list(range(1, 151)), 0.99) == 149
+    assert percentile(list(range(1, 101)), 0.95) == 95
+    assert percentile([7], 0.99) == 7
+    assert percentile([1, 2, 3], 0.0) == 1
@@ -0,0 +1,40 @@
+import json
+from types import SimpleNamespace
+
+from page_cache import PageCache
+
+URL = "https://www.changiairport.com/in/en.html"
+BODY = b"<html><body><p>Welcome</p></body></html>"
+
+
+def make_response():
+    return SimpleNamespace(headers={"ETag": '"v1"'}, content=BODY)
+
+
+def test_text_of_another_backend_is_a_miss(tmp_path):
+    cache = PageCache(str(tmp_path))
+    cache.store(URL, make_response(), "Welcome", "lxml")
+
+    assert cache.conditional_headers(URL, "lxml") == {"If-None-Match": '"v1"'}
+    assert cache.not_modified(URL, "lxml") == "Welcome"
+    assert cache.unchanged(URL, BODY, "lxml") == "Welcome"
+
+    assert cache.conditional_headers(URL, "bs4") == {}
+    assert cache.not_modified(URL, "bs4") is None
+    assert cache.unchanged(URL, BODY, "bs4") is None
+
+
+def test_entries_without_a_backend_are_misses(tmp_path):
+    cache = PageCache(str(tmp_path))
+    cache.store(URL, make_response(), "Welcome")
+    cache.save()
+    with open(cache.index_path, "r", encoding="utf-8") as file:
+        entries = json.load(file)
+    for entry in entries:
+        del entry["backend"]
+    with open(cache.index_path, "w", encoding="utf-8") as file:
+        json.dump(entries, file)
+
+    cache = PageCache(str(tmp_path))
+    assert cache.conditional_headers(URL) == {}
+    assert cache.unchanged(URL, BODY) is None
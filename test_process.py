@@ -0,0 +1,52 @@
+import contextlib
+import io
+import os
+import random
+
+from dedup import NearDuplicateIndex
+from process import process_categories, redundant_end, redundant_start
+from records import make_record
+from routing import CategoryRouter
+
+CANONICAL_URL = "https://www.changiairport.com/in/en/rewards/dashboard.html"
+ALIAS_URL = "https://www.changiairport.com/in/en/rewards/my-rewards.html"
+
+
+def make_words(count, seed):
+    generator = random.Random(seed)
+    return " ".join(f"word{generator.randrange(100000)}" for _ in range(count))
+
+
+def run_process(records, output_dir, manifest):
+    with contextlib.redirect_stdout(io.StringIO()):
+        process_categories(records, CategoryRouter(), redundant_start, redundant_end, manifest,
+                           NearDuplicateIndex(), output_dir=output_dir)
+    with open(os.path.join(output_dir, "rewards.json"), "r", encoding="utf-8") as file:
+        return file.read()
+
+
+def test_alias_is_rechecked_when_its_canonical_page_changes(tmp_path):
+    body = make_words(300, seed=1)
+    records = [
+        make_record(CANONICAL_URL, body, fetched_at=""),
+        make_record(ALIAS_URL, body + " Member exclusive", fetched_at=""),
+    ]
+    incremental_dir = tmp_path / "incremental"
+    incremental_dir.mkdir()
+    manifest = {"config": None, "pages": {}}
+    first = run_process(records, incremental_dir, manifest)
+    assert ALIAS_URL not in first
+    assert manifest["pages"][ALIAS_URL]["alias_of"] == CANONICAL_URL
+
+    # Rewrite half of the canonical page so the other page is no longer a near-duplicate of it
+    changed_body = body.split()[:150] + make_words(150, seed=2).split()
+    records[0] = make_record(CANONICAL_URL, " ".join(changed_body), fetched_at="")
+    incremental = run_process(records, incremental_dir, manifest)
+
+    full_dir = tmp_path / "full"
+    full_dir.mkdir()
+    full = run_process(records, full_dir, {"config": None, "pages": {}})
+
+    assert ALIAS_URL in full
+    assert incremental == full
+    assert manifest["pages"][ALIAS_URL]["alias_of"] is None
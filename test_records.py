@@ -0,0 +1,13 @@
+from records import iter_records
+
+
+def test_last_record_without_trailing_newline_is_kept(tmp_path):
+    path = tmp_path / "pages.jsonl"
+    path.write_text('{"url": "a", "text": "x"}\n{"url": "b", "text": "y"}', encoding="utf-8")
+    assert [record["url"] for record in iter_records(str(path))] == ["a", "b"]
+
+
+def test_truncated_last_record_is_skipped(tmp_path):
+    path = tmp_path / "pages.jsonl"
+    path.write_text('{"url": "a", "text": "x"}\n{"url": "b", "te', encoding="utf-8")
+    assert [record["url"] for record in iter_records(str(path))] == ["a"]